@@ -0,0 +1,112 @@
+"""Duration-based admission for the download and transcribe stages.
+
+An entry longer than its source's max duration (MAX_DURATION, or the
+source's line in DURATION_OVERRIDES) is rejected: marked dead, so it leaves
+the work queue instead of taking up a batch slot on every pass. One longer
+than LONG_DURATION only runs during OFFPEAK_HOURS, so a multi-hour archive
+doesn't tie up the Whisper pool while short items wait. Entries of unknown
+duration are admitted; the downloader checks again once extraction has
+told it the duration. An entry waiting for off-peak hours gets its
+next_retry_at set to the window's start, so the download and transcribe
+queries (and the worker's wake-up time) skip it until then instead of
+filling their batch with it. The reason an entry is held back is stored in
+videos.defer_reason for /api/progress, and cleared once it is admitted.
+"""
+from datetime import datetime, timedelta
+
+from briefing.config import MAX_DURATION, LONG_DURATION, OFFPEAK_HOURS, DURATION_OVERRIDES
+from briefing.db import entry_stage, delete_partials
+
+
+def _overrides() -> dict[str, int]:
+    """DURATION_OVERRIDES lines '<source url> <minutes>' -> {url: minutes}."""
+    out = {}
+    for line in DURATION_OVERRIDES:
+        url, _, minutes = str(line).strip().rpartition(" ")
+        try:
+            out[url.strip()] = int(minutes)
+        except ValueError:
+            continue
+    return out
+
+_OVERRIDES = _overrides()
+
+
+def _offpeak_hours(spec: str) -> set[int] | None:
+    """'1-7' -> {1..6}; '22-6' wraps past midnight. None if unparseable."""
+    try:
+        start, end = (int(x) % 24 for x in spec.split("-"))
+    except ValueError:
+        return None
+    if start == end:
+        return set(range(24))
+    return {h % 24 for h in range(start, end if end > start else end + 24)}
+
+_OFFPEAK = _offpeak_hours(OFFPEAK_HOURS)
+
+
+def reject_reason(entry) -> str | None:
+    """Why `entry` will never run (too long for its source), or None."""
+    if not entry.duration:
+        return None
+    minutes = entry.duration / 60
+    limit = _OVERRIDES.get(entry.source, MAX_DURATION)
+    if limit and minutes > limit:
+        return f"{minutes:.0f} min is over the {limit} min limit"
+    return None
+
+
+def defer_reason(entry, now: datetime | None = None) -> str | None:
+    """Why `entry` must wait (or is rejected), or None when it may run now."""
+    if not entry.duration:
+        return None
+    reason = reject_reason(entry)
+    if reason:
+        return reason
+    minutes = entry.duration / 60
+    if LONG_DURATION and minutes > LONG_DURATION and _OFFPEAK:
+        hour = (now or datetime.now()).hour
+        if hour not in _OFFPEAK:
+            return f"{minutes:.0f} min, waits for off-peak hours {OFFPEAK_HOURS}"
+    return None
+
+
+def next_offpeak(now: datetime) -> datetime:
+    """Start of the next off-peak hour after `now`."""
+    t = now.replace(minute=0, second=0, microsecond=0)
+    for _ in range(24):
+        t += timedelta(hours=1)
+        if _OFFPEAK and t.hour in _OFFPEAK:
+            break
+    return t
+
+
+def hold(entry, now: datetime | None = None) -> bool:
+    """Record on `entry` why it must wait (marking it dead when rejected, or
+    not due before off-peak hours); True when it may run now."""
+    now = now or datetime.now()
+    entry.defer_reason = defer_reason(entry, now)
+    if entry.defer_reason is None:
+        return True
+    if reject_reason(entry):
+        entry.dead = 1
+        delete_partials(entry.video_id)
+    else:
+        entry.next_retry_at = next_offpeak(now).isoformat(timespec="seconds")
+    return False
+
+
+def admit(session, entries: list) -> list:
+    """The entries that may run now; records defer_reason on all of them."""
+    now = datetime.now()
+    admitted, changed = [], False
+    for v in entries:
+        before = (v.defer_reason, v.dead, v.next_retry_at)
+        if hold(v, now):
+            admitted.append(v)
+        if (v.defer_reason, v.dead, v.next_retry_at) != before:
+            v.stage = entry_stage(v)
+            changed = True
+    if changed:
+        session.commit()
+    return admitted
@@ -80,10 +80,23 @@ TRANSCRIBER_LIMIT = None
 SUMMARIZER_LIMIT = None
 PUSHER_LIMIT = None
 PUSH_TO = "ntfy"
+WORKER_MODE = "pipeline"
 DOWNLOAD_INTERVAL = None
+MIN_POLL_INTERVAL = 15 * 60
+MAX_POLL_INTERVAL = 24 * 60 * 60
 PROCESS_INTERVAL = None
 PUSHER_INTERVAL = None
 POOL_NUM = None
+DOWNLOAD_WORKERS = 3
+BANDWIDTH_LIMIT = None
+AUDIO_FORMAT = "native"
+SUBTITLES = "off"
+DOUYIN_MEDIA = "audio"
+MAX_DURATION = None
+LONG_DURATION = None
+OFFPEAK_HOURS = "1-7"
+DURATION_OVERRIDES = []
+SOURCE_WEIGHTS = []
 COMPRESS_LEVEl = None
 ENTRIES_LIMIT = None
 SOURCE_URLS = []
@@ -107,10 +120,23 @@ if CONFIG_JSON.exists():
     SUMMARIZER_LIMIT = _cfg["SUMMARIZER_LIMIT"]
     PUSHER_LIMIT = _cfg["PUSHER_LIMIT"]
     PUSH_TO = str(_cfg.get("PUSH_TO", "ntfy"))
+    WORKER_MODE = str(_cfg.get("WORKER_MODE", "pipeline"))
     DOWNLOAD_INTERVAL = int(_cfg["DOWNLOAD_INTERVAL"])
+    MIN_POLL_INTERVAL = int(_cfg["MIN_POLL_INTERVAL"])
+    MAX_POLL_INTERVAL = max(int(_cfg["MAX_POLL_INTERVAL"]), MIN_POLL_INTERVAL)
     PROCESS_INTERVAL = int(_cfg["PROCESS_INTERVAL"])
     PUSHER_INTERVAL = int(_cfg["PUSHER_INTERVAL"])
     POOL_NUM = int(_cfg["POOL_NUM"])
+    DOWNLOAD_WORKERS = int(_cfg["DOWNLOAD_WORKERS"])
+    BANDWIDTH_LIMIT = _cfg["BANDWIDTH_LIMIT"]  # KB/s or None
+    AUDIO_FORMAT = str(_cfg.get("AUDIO_FORMAT", "native"))
+    SUBTITLES = str(_cfg.get("SUBTITLES", "off"))
+    DOUYIN_MEDIA = str(_cfg.get("DOUYIN_MEDIA", "audio"))
+    MAX_DURATION = _cfg["MAX_DURATION"]    # minutes or None
+    LONG_DURATION = _cfg["LONG_DURATION"]  # minutes or None
+    OFFPEAK_HOURS = str(_cfg.get("OFFPEAK_HOURS", "1-7"))
+    DURATION_OVERRIDES = list(_cfg.get("DURATION_OVERRIDES", []))
+    SOURCE_WEIGHTS = list(_cfg.get("SOURCE_WEIGHTS", []))
     COMPRESS_LEVEl = int(_cfg["COMPRESS_LEVEl"])
     ENTRIES_LIMIT = f"1-{int(_cfg['ENTRIES_LIMIT'])}"  # "1-x"
     SOURCE_URLS = [str(x).strip() for x in _cfg.get("SOURCE_URLS", []) if str(x).strip()]
@@ -8,13 +8,26 @@ installed browser, then run:
 
 Cookies from every readable browser are merged into cookies.txt next to the
 project; douyin_downloader filters the douyin.com entries from it at runtime.
+
+At runtime the worker goes through `cookie_manager` instead: it fingerprints
+each browser's cookie store (path + mtime + size of the DB and its journal)
+and only re-extracts a browser whose store changed, so an unchanged setup
+costs a few stat() calls per pass. A re-extracted browser replaces the
+cookies it contributed last time (so ones deleted in the browser go too) and
+expired cookies are dropped. The merged jar is kept in memory and shared by
+the yt-dlp and Douyin paths.
 """
+import glob
+import json
+import os
 import sys
+import threading
 from http.cookiejar import MozillaCookieJar
+from pathlib import Path
 
 from yt_dlp import YoutubeDL
 
-from briefing.config import COOKIES_TXT
+from briefing.config import COOKIES_TXT, DATA_DIR
 
 # Ordered by how common they are; unknown/uninstalled ones are skipped.
 ALL_BROWSERS = ["safari", "edge", "firefox", "chrome"]
@@ -27,6 +40,17 @@ class _SilentLogger:
     def error(self, msg): pass
 
 
+def _extract(browser: str) -> list:
+    """All cookies yt-dlp can read (and decrypt) from one browser."""
+    with YoutubeDL({
+        "cookiesfrombrowser": (browser,),
+        "quiet": True,
+        "no_warnings": True,
+        "logger": _SilentLogger(),
+    }) as ydl:
+        return list(ydl.cookiejar)  # lazily extracts on access
+
+
 def create_cookies_txt(browsers: list[str] | None = None) -> None:
     browsers = browsers or ALL_BROWSERS
     merged = MozillaCookieJar(str(COOKIES_TXT))
@@ -34,20 +58,13 @@ def create_cookies_txt(browsers: list[str] | None = None) -> None:
     report = []
     for b in browsers:
         try:
-            with YoutubeDL({
-                "cookiesfrombrowser": (b,),
-                "quiet": True,
-                "no_warnings": True,
-                "logger": _SilentLogger(),
-            }) as ydl:
-                jar = ydl.cookiejar  # lazily extracts on access
-                total = 0
-                douyin = 0
-                for c in jar:
-                    merged.set_cookie(c)
-                    total += 1
-                    if "douyin.com" in (c.domain or ""):
-                        douyin += 1
+            total = 0
+            douyin = 0
+            for c in _extract(b):
+                merged.set_cookie(c)
+                total += 1
+                if "douyin.com" in (c.domain or ""):
+                    douyin += 1
             report.append(f"  {b:9s} ok   total={total:<5d} douyin={douyin}")
         except Exception as e:
             report.append(f"  {b:9s} skip {type(e).__name__}: {e}")
@@ -60,6 +77,170 @@ def create_cookies_txt(browsers: list[str] | None = None) -> None:
     print(f"Saved cookies to {COOKIES_TXT}\n")
 
 
+# --------------------------------------------------------------------------- #
+# runtime cookie manager
+# --------------------------------------------------------------------------- #
+_HOME = Path.home()
+_LOCAL = Path(os.environ.get("LOCALAPPDATA") or _HOME / "AppData" / "Local")
+_ROAMING = Path(os.environ.get("APPDATA") or _HOME / "AppData" / "Roaming")
+_MAC = _HOME / "Library" / "Application Support"
+
+# Where each browser keeps its cookie DB, per OS (profiles globbed).
+_CHROMIUM = ("*/Cookies", "*/Network/Cookies")
+_STORES = {
+    "chrome": [str(d / p) for d in (_HOME / ".config/google-chrome", _MAC / "Google/Chrome",
+                                     _LOCAL / "Google/Chrome/User Data") for p in _CHROMIUM],
+    "edge": [str(d / p) for d in (_HOME / ".config/microsoft-edge", _MAC / "Microsoft Edge",
+                                  _LOCAL / "Microsoft/Edge/User Data") for p in _CHROMIUM],
+    "firefox": [str(d / "*/cookies.sqlite") for d in (_HOME / ".mozilla/firefox", _MAC / "Firefox/Profiles",
+                                                       _ROAMING / "Mozilla/Firefox/Profiles")],
+    "safari": [str(_HOME / "Library/Cookies/Cookies.binarycookies"),
+               str(_HOME / "Library/Containers/com.apple.Safari/Data/Library/Cookies/Cookies.binarycookies")],
+}
+# Writes may sit in the journal until the DB is checkpointed.
+_SIDECARS = ("", "-wal", "-journal")
+
+_FINGERPRINTS = DATA_DIR / ".cookie_stores.json"
+_OWNERS = DATA_DIR / ".cookie_owners.json"  # browser -> [[domain, path, name], ...] it contributed
+
+
+def _key(c) -> list:
+    return [c.domain, c.path, c.name]
+
+
+def _fingerprint(browser: str) -> list:
+    """[[path, mtime_ns, size], ...] of the browser's cookie files; [] if not installed."""
+    out = []
+    for pattern in _STORES.get(browser, ()):
+        for db in sorted(glob.glob(pattern)):
+            for p in (db + s for s in _SIDECARS):
+                try:
+                    st = os.stat(p)
+                except OSError:
+                    continue
+                out.append([p, st.st_mtime_ns, st.st_size])
+    return out
+
+
+class CookieManager:
+    """One cookie jar for the whole process, refreshed from the browsers whose
+    stores changed since the last look. Fingerprints persist across runs next
+    to cookies.txt, so a restart doesn't re-extract anything unchanged either.
+    A failed extraction (locked store, keyring not unlocked) records the
+    fingerprint as well: it is retried once the store changes, not every pass."""
+
+    def __init__(self, browsers: list[str] = ALL_BROWSERS):
+        self._browsers = browsers
+        self._lock = threading.Lock()
+        self._jar: MozillaCookieJar | None = None
+        self._file_stamp = None
+        self.version = 0  # bumped whenever the jar changes
+        try:
+            self._fps = json.loads(_FINGERPRINTS.read_text(encoding="utf-8"))
+        except Exception:
+            self._fps = {}
+        try:
+            self._owners = json.loads(_OWNERS.read_text(encoding="utf-8"))
+            self._rebuild = False
+        except Exception:
+            # no record of who contributed what (first run of this version):
+            # re-extract every browser once into a fresh jar
+            self._owners = {}
+            self._fps = {}
+            self._rebuild = True
+
+    def _load_file(self) -> MozillaCookieJar:
+        jar = MozillaCookieJar(str(COOKIES_TXT))
+        if COOKIES_TXT.exists():
+            try:
+                jar.load(ignore_discard=True, ignore_expires=True)
+            except Exception:
+                pass
+        return jar
+
+    def _stamp(self):
+        try:
+            st = COOKIES_TXT.stat()
+            return (st.st_mtime_ns, st.st_size)
+        except OSError:
+            return None
+
+    def refresh(self) -> bool:
+        """Re-extract browsers whose cookie store changed; True if the jar changed."""
+        with self._lock:
+            changed = False
+            stamp = self._stamp()
+            if self._jar is None or stamp != self._file_stamp:
+                # first use, or cookies.txt edited / re-exported by hand
+                self._jar = self._load_file()
+                changed = True
+
+            # Updates go into a copy that replaces the jar at the end, so threads
+            # still iterating the old one never see it change under them.
+            jar = None
+            updated, failed = [], []
+            for b in self._browsers:
+                fp = _fingerprint(b)
+                if not fp or fp == self._fps.get(b):
+                    continue
+                try:
+                    cookies = _extract(b)
+                except Exception as e:
+                    print(f"[cookies] {b} skipped: {type(e).__name__}")
+                    self._fps[b] = fp
+                    failed.append(b)
+                    continue
+                if jar is None:
+                    jar = MozillaCookieJar(str(COOKIES_TXT))
+                    for c in () if self._rebuild else self._jar:
+                        jar.set_cookie(c)
+                # this browser's cookies from last time are replaced, not merged into
+                for domain, path, name in self._owners.get(b, ()):
+                    try:
+                        jar.clear(domain, path, name)
+                    except KeyError:
+                        pass
+                for c in cookies:
+                    jar.set_cookie(c)
+                self._owners[b] = [_key(c) for c in cookies]
+                self._fps[b] = fp
+                updated.append(b)
+
+            if updated:
+                jar.clear_expired_cookies()
+                self._jar = jar
+                self._rebuild = False
+                try:
+                    COOKIES_TXT.parent.mkdir(parents=True, exist_ok=True)
+                    jar.save(ignore_discard=True, ignore_expires=True)
+                    _OWNERS.write_text(json.dumps(self._owners), encoding="utf-8")
+                except Exception as e:
+                    print(f"[cookies] save failed: {type(e).__name__}: {e}")
+                print(f"[cookies] refreshed from {', '.join(updated)}")
+                changed = True
+            if updated or failed:
+                try:
+                    _FINGERPRINTS.write_text(json.dumps(self._fps), encoding="utf-8")
+                except Exception as e:
+                    print(f"[cookies] save failed: {type(e).__name__}: {e}")
+            self._file_stamp = self._stamp()
+            if changed:
+                self.version += 1
+            return changed
+
+    def jar(self) -> MozillaCookieJar:
+        """The shared jar (loaded on first use); treat it as read-only."""
+        with self._lock:
+            if self._jar is None:
+                self._jar = self._load_file()
+                self._file_stamp = self._stamp()
+                self.version += 1
+            return self._jar
+
+
+cookie_manager = CookieManager()
+
+
 if __name__ == "__main__":
     args = sys.argv[1:]
     create_cookies_txt(args or None)
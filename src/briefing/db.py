@@ -1,13 +1,18 @@
-from sqlalchemy import create_engine, Column, Integer, Float, String, UniqueConstraint, select
-from sqlalchemy.orm import declarative_base
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy import create_engine, event, Column, Index, Integer, Float, String, UniqueConstraint, select, update, or_, case, func
+from sqlalchemy.orm import declarative_base, Session
+from sqlalchemy.pool import QueuePool
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.inspection import inspect
 from datetime import datetime, timedelta
+from contextlib import contextmanager
 from pathlib import Path
+import multiprocessing
 import shutil
+import sqlite3
 import os, stat, time
 
 from briefing.config import DB_URL, AUDIO_DIR, OUTPUT_DIR, TEMPORARY_DIR, check_config, UPDATE_LIMIT, ENTRIES_LIMIT
+from briefing.priority import entry_priority
 
 # ENTRIES_LIMIT is the yt-dlp "1-x" string; the plain integer is the per-source keep count.
 try:
@@ -15,7 +20,67 @@ try:
 except Exception:
     _ENTRIES_LIMIT_INT = 3
 
-engine = create_engine(DB_URL, future=True)
+# Every connection, worker or web, runs in WAL mode: readers never block the
+# writer and vice versa, and a commit is one append to the WAL (synchronous=NORMAL
+# only syncs at checkpoints; a power cut can lose the last commits, never the DB).
+_BUSY_TIMEOUT_MS = 10_000
+_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    f"PRAGMA busy_timeout={_BUSY_TIMEOUT_MS}",
+    "PRAGMA mmap_size=268435456",   # 256 MB
+    "PRAGMA cache_size=-16000",     # 16 MB
+    "PRAGMA temp_store=MEMORY",
+)
+
+def _set_pragmas(dbapi_conn, read_only: bool = False) -> None:
+    cur = dbapi_conn.cursor()
+    try:
+        for pragma in _PRAGMAS:
+            cur.execute(pragma)
+        if read_only:
+            cur.execute("PRAGMA query_only=1")
+    finally:
+        cur.close()
+
+engine = create_engine(DB_URL, future=True, connect_args={"timeout": _BUSY_TIMEOUT_MS / 1000})
+
+@event.listens_for(engine, "connect")
+def _connect(dbapi_conn, _):
+    _set_pragmas(dbapi_conn)
+
+# Small pool of read-only connections for the web handlers (see read_connection).
+read_engine = create_engine(
+    DB_URL, future=True, poolclass=QueuePool, pool_size=2, max_overflow=4,
+    connect_args={"check_same_thread": False, "timeout": _BUSY_TIMEOUT_MS / 1000},
+)
+
+@event.listens_for(read_engine, "connect")
+def _read_connect(dbapi_conn, _):
+    _set_pragmas(dbapi_conn, read_only=True)
+    dbapi_conn.row_factory = sqlite3.Row
+
+@contextmanager
+def read_connection():
+    """A pooled read-only sqlite3 connection (rows are sqlite3.Row), returned
+    to the pool on exit. For plain SELECTs where the ORM isn't needed."""
+    conn = read_engine.raw_connection()
+    try:
+        yield conn
+    finally:
+        conn.rollback()  # end the read transaction so the WAL can be checkpointed
+        conn.close()
+
+def checkpoint() -> None:
+    """Fold the WAL back into the database file, so the file alone is complete."""
+    with engine.connect() as conn:
+        conn.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)")
+
+def dispose_engines() -> None:
+    """Close every pooled connection (before the database file is replaced)."""
+    engine.dispose()
+    read_engine.dispose()
+
 Base = declarative_base()
 
 AUDIO_SUFFIXES = {
@@ -41,14 +106,54 @@ class Video(Base):
     downloaded_at = Column(String)                              # download time 20251225
     file_path = Column(String)                                  # video path
     download_error = Column(String)                             # file name
+    download_attempts = Column(Integer, nullable=False, default=0)  # failed downloads so far
+    next_retry_at = Column(String)                              # not due (download retry / off-peak hold) before 2025-12-25T10:00:00
+    dead = Column(Integer, nullable=False, default=0)           # 0/1 given up on (permanent error / too many attempts / too long)
+    defer_reason = Column(String)                               # why admission holds it back (see admission.py)
+    priority = Column(Float, nullable=False, default=0.0)       # queue order, higher first (see priority.py)
     transcribed = Column(Integer, nullable=False, default=0)    # 0/1
     summarized = Column(Integer, nullable=False, default=0)     # 0/1
     pushed = Column(Integer, nullable=False, default=0)         # 0/1
-    video_id = Column(String)                                   # video filename
+    stage = Column(String)                                      # download / transcribe / summarize / push / done / dead (see entry_stage)
+    video_id = Column(String, index=True)                       # video filename
     domain = Column(String)                                     # finance / other (set by review stage)
     tokens = Column(Integer, nullable=False, default=0)         # LLM tokens used (summarize)
     cost = Column(Float, nullable=False, default=0.0)           # LLM cost in USD
-    __table_args__ = (UniqueConstraint("webpage_url", name="uq_webpage_url"),)
+    __table_args__ = (
+        UniqueConstraint("webpage_url", name="uq_webpage_url"),
+        # work-queue lookups: next entries of a stage in queue order, and a source's entries per stage
+        Index("ix_videos_stage_priority", stage, priority.desc(), inserted_at),
+        Index("ix_videos_source_stage", source, stage),
+    )
+
+
+def entry_stage(v) -> str:
+    """The stage an entry is waiting for, derived from its flags."""
+    if v.dead:
+        return "dead"
+    if not v.downloaded:
+        return "download"
+    if not v.transcribed:
+        return "transcribe"
+    if not v.summarized:
+        return "summarize"
+    if not v.pushed:
+        return "push"
+    return "done"
+
+def _stage_case():
+    """entry_stage() as a SQL expression, for rows updated or stored without it."""
+    return case(
+        (Video.dead == 1, "dead"),
+        (Video.downloaded == 0, "download"),
+        (Video.transcribed == 0, "transcribe"),
+        (Video.summarized == 0, "summarize"),
+        (Video.pushed == 0, "push"),
+        else_="done",
+    )
+
+# flag columns videos.stage is derived from
+_STAGE_FLAGS = {"downloaded", "transcribed", "summarized", "pushed", "dead"}
 
 
 class Feedback(Base):
@@ -60,8 +165,30 @@ class Feedback(Base):
     applied = Column(Integer, nullable=False, default=0)        # 0/1 distilled into notes yet
 
 
+class Source(Base):
+    __tablename__ = "sources"
+    url = Column(String, primary_key=True)                      # source url, as in SOURCE_URLS
+    high_water = Column(String)                                 # webpage_url of the newest entry listed
+    channel_id = Column(String)                                 # YouTube channel id, for its Atom feed
+    etag = Column(String)                                       # feed ETag from the last 200
+    last_modified = Column(String)                              # feed Last-Modified from the last 200
+    last_polled = Column(Float)                                 # epoch seconds of the last listing
+    next_due = Column(Float)                                    # epoch seconds of the next listing
+    failures = Column(Integer, nullable=False, default=0)       # consecutive failed listings
+    items_per_day = Column(Float, nullable=False, default=0.0)  # smoothed rate of new entries
+    upload_history = Column(String)                             # JSON list of recent upload times
+    sec_uid = Column(String)                                    # Douyin sec_user_id of the homepage
+    cursor = Column(Integer)                                    # Douyin max_cursor an unfinished catch-up resumes from
+
+
+# Indexes earlier versions created that a newer one supersedes; dropped on sync.
+_RETIRED_INDEXES = {
+    "ix_videos_priority",  # covered by ix_videos_stage_priority
+}
+
 def _sync_schema() -> None:
-    """Add any model column missing from its existing table, for every table."""
+    """Add any model column or index missing from its existing table (and drop
+    retired indexes), for every table."""
     insp = inspect(engine)
     existing = set(insp.get_table_names())
     for table in Base.metadata.sorted_tables:
@@ -72,14 +199,44 @@ def _sync_schema() -> None:
             for col in table.columns:
                 if col.name not in have:
                     coltype = col.type.compile(engine.dialect)
+                    # a scalar default also back-fills the rows already there
+                    default = col.default.arg if col.default is not None and col.default.is_scalar else None
+                    clause = f" DEFAULT {default!r}" if isinstance(default, (int, float, str)) else ""
                     conn.exec_driver_sql(
-                        f"ALTER TABLE {table.name} ADD COLUMN {col.name} {coltype}"
+                        f"ALTER TABLE {table.name} ADD COLUMN {col.name} {coltype}{clause}"
                     )
+        indexed = {i["name"] for i in insp.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in indexed:
+                index.create(bind=engine)
+        retired = indexed & _RETIRED_INDEXES
+        if retired:
+            with engine.begin() as conn:
+                for name in retired:
+                    conn.exec_driver_sql(f"DROP INDEX IF EXISTS {name}")
+
+def _backfill_priority() -> None:
+    """Score rows stored before videos.priority existed (they hold the 0 default)."""
+    with Session(engine, future=True) as session:
+        rows = session.query(Video).filter(Video.priority == 0).all()
+        for v in rows:
+            v.priority = entry_priority(v)
+        if rows:
+            session.commit()
+
+def _backfill_stage() -> None:
+    """Set videos.stage on rows stored before it existed (or written by a version
+    that didn't maintain it)."""
+    with engine.begin() as conn:
+        expr = _stage_case()
+        conn.execute(update(Video).where(Video.stage.is_distinct_from(expr)).values(stage=expr))
 
 def init_db() -> None:
     # Ensure DB file & tables exist, and existing tables match the models.
     Base.metadata.create_all(bind=engine)
     _sync_schema()
+    _backfill_priority()
+    _backfill_stage()
 
     ok, missing, errors = check_config()
     if ok:
@@ -109,7 +266,9 @@ def clean_all(session) -> None:
                     if not any(p.iterdir()):
                         p.rmdir()
                 elif p.is_file():
-                    continue
+                    # resumable partial download of an entry that no longer exists
+                    if _is_partial(p) and p.name.split(".")[0] not in valid_ids:
+                        p.unlink()
             except Exception:
                 pass
 
@@ -165,6 +324,7 @@ def clean_entries(session) -> int:
             if ts >= cutoff:
                 continue
             delete_audio_by_path(v.file_path)
+            delete_partials(v.video_id)
             try:
                 session.query(Feedback).filter(Feedback.video_id == v.video_id).delete()
                 session.delete(v)
@@ -189,6 +349,25 @@ def delete_audio_by_path(file_path: str) -> bool:
         print(f"Delete error on {file_path}: {e}")
         return False
 
+def _is_partial(p: Path) -> bool:
+    # <id>.part, <id>.part.1, <id>.part.json, <id>.audio.m4a.part, <id>.webm.ytdl ...
+    return any(s.lower() in PARTIAL_SUFFIXES for s in p.suffixes)
+
+def delete_partials(video_id: str | None) -> int:
+    """Remove the resumable partial downloads of an entry that won't be
+    downloaded any more (dead or deleted)."""
+    if not video_id:
+        return 0
+    removed = 0
+    for p in AUDIO_DIR.glob(f"{video_id}.*"):
+        try:
+            if p.is_file() and _is_partial(p):
+                p.unlink()
+                removed += 1
+        except Exception:
+            pass
+    return removed
+
 def check_is_entry(entry: dict) -> bool:
     if not isinstance(entry, dict):
         return False
@@ -220,14 +399,13 @@ def init_entries(session, entries) -> int:
         pushed            Guaranteed  <-
         video_id          Exist
     '''
-    inserted = 0
-
+    rows = []
+    inserted_at = datetime.now().isoformat(timespec="seconds")
     for e in entries:
         if not check_is_entry(e):
             continue
-        
-        inserted_at = datetime.now().isoformat(timespec="seconds")
-        row = Video(
+
+        rows.append(Video(
             source=e["source"],
             extractor=e.get("extractor"),
             upload_date=e.get("upload_date"),
@@ -239,18 +417,57 @@ def init_entries(session, entries) -> int:
             downloaded=0,
             transcribed=0,
             video_id=e["video_id"]
-        )
+        ))
 
-        session.add(row)
-        try:
-            session.commit()  # UNIQUE(webpage_url)
-            inserted += 1
-        except IntegrityError:
-            session.rollback()  # duplicate -> ignore
-        except Exception as ex:
-            print(f"Save error on {row.webpage_url}: {type(ex).__name__}: {ex}")
+    return len(insert_entries(session, rows))
+
+# SQLite caps bound parameters per statement (999 on older builds).
+_IN_CHUNK = 500
+
+def _row_dict(v: Video) -> dict:
+    """All columns of an unsaved row, scalar defaults filled in (executemany
+    needs the same keys on every row)."""
+    row = {}
+    for c in Video.__table__.columns:
+        if c.key == "id":
+            continue
+        val = getattr(v, c.key)
+        if val is None and c.default is not None and c.default.is_scalar:
+            val = c.default.arg
+        row[c.key] = val
+    return row
+
+def insert_entries(session, entries: list[Video]) -> set[str]:
+    """Insert rows with INSERT ... ON CONFLICT(webpage_url) DO NOTHING, all in
+    one transaction; returns the video_ids that were actually new."""
+    rows, seen = [], set()
+    for v in entries:
+        if not v.webpage_url or v.webpage_url in seen:
+            continue
+        seen.add(v.webpage_url)
+        v.priority = entry_priority(v)
+        v.stage = entry_stage(v)
+        rows.append(_row_dict(v))
+    if not rows:
+        return set()
 
-    return inserted
+    try:
+        urls = [r["webpage_url"] for r in rows]
+        have = set()
+        for i in range(0, len(urls), _IN_CHUNK):
+            have.update(session.scalars(
+                select(Video.webpage_url).where(Video.webpage_url.in_(urls[i:i + _IN_CHUNK]))
+            ))
+        new = [r for r in rows if r["webpage_url"] not in have]
+        if new:
+            stmt = sqlite_insert(Video).on_conflict_do_nothing(index_elements=["webpage_url"])
+            session.execute(stmt, new)
+        session.commit()
+    except Exception as ex:
+        session.rollback()
+        print(f"Save error on {len(rows)} entries: {type(ex).__name__}: {ex}")
+        return set()
+    return {r["video_id"] for r in new}
 
 def entry_to_payload(v: Video) -> dict:
     return {
@@ -265,45 +482,171 @@ def payload_to_entry(payload: dict) -> Video:
     return v
 
 def save_entries(session, entries: list[Video]) -> int:
-    inserted = 0
-    for v in entries:
-        session.add(v)
-        try:
-            session.commit()  # UNIQUE(webpage_url)
-            inserted += 1
-        except IntegrityError:
-            session.rollback()  # duplicate -> ignore
-        except Exception as ex:
-            print(f"Save error on {v.webpage_url}: {type(ex).__name__}: {ex}")
-    return inserted
+    return len(insert_entries(session, entries))
+
+def update_columns(session, rows: list[dict]) -> int:
+    """Column-level updates by primary key: each dict is {"id": ..., col: value, ...}.
+    One bulk UPDATE (executemany) in one transaction; rows that change a flag
+    without giving their stage get it recomputed in SQL."""
+    rows = [r for r in rows if r.get("id") is not None]
+    if not rows:
+        return 0
+    restage = [r["id"] for r in rows if "stage" not in r and _STAGE_FLAGS & r.keys()]
+    try:
+        session.execute(update(Video), rows)
+        for i in range(0, len(restage), _IN_CHUNK):
+            session.execute(
+                update(Video)
+                .where(Video.id.in_(restage[i:i + _IN_CHUNK]))
+                .values(stage=_stage_case())
+                .execution_options(synchronize_session=False)
+            )
+        session.commit()
+        return len(rows)
+    except Exception as ex:
+        session.rollback()
+        print(f"Update error on {len(rows)} entries: {type(ex).__name__}: {ex}")
+        return 0
 
 def update_entries(session, entries: list[Video]) -> int:
-    updated = 0
+    """Write whole entries back by primary key in one transaction."""
+    rows = []
     for v in entries:
-        try:
-            session.merge(v)
-            session.commit()
-            updated += 1
-        except Exception as ex:
-            session.rollback()
-            print(f"Update error on {v.webpage_url}: {type(ex).__name__}: {ex}")
-    return updated
+        v.priority = entry_priority(v)  # duration / upload date may have just been learned
+        v.stage = entry_stage(v)
+        rows.append({c.key: getattr(v, c.key) for c in Video.__table__.columns})
+    updated = update_columns(session, rows)
+    if updated or len(rows) <= 1:
+        return updated
+    # the batch failed as a whole: retry row by row so one bad entry can't sink the rest
+    return sum(update_columns(session, [r]) for r in rows)
+
+
+class BatchWriter:
+    """Buffers finished entries streaming out of a pool and writes them with
+    update_entries(): every `size` entries, once `interval` seconds have passed
+    since the last write, and on close. `on_flush(entries)` runs after each
+    successful write (to wake the next stage).
+
+    The interval is kept by the caller's wait loop: it waits for the next
+    result at most `timeout()` seconds and calls `tick()`, so a buffered entry
+    is written on time even when no other result follows.
+
+    Slow stages (one result per minute) effectively write every entry at once;
+    fast ones (downloads finishing together) share a transaction."""
+
+    def __init__(self, session, size: int = 20, interval: float = 5.0, on_flush=None):
+        self.session = session
+        self.size = size
+        self.interval = interval
+        self.on_flush = on_flush
+        self.written = 0
+        self._buf: list[Video] = []
+        self._since = time.monotonic()
+
+    def add(self, entry: Video) -> None:
+        self._buf.append(entry)
+        if len(self._buf) >= self.size or time.monotonic() - self._since >= self.interval:
+            self.flush()
+
+    def timeout(self) -> float | None:
+        """Seconds until the buffer is due to be written; None when it is empty."""
+        if not self._buf:
+            return None
+        return max(0.0, self.interval - (time.monotonic() - self._since))
+
+    def tick(self) -> int:
+        """Write the buffer if its interval has run out."""
+        if self._buf and time.monotonic() - self._since >= self.interval:
+            return self.flush()
+        return 0
+
+    def drain(self, results) -> None:
+        """add() the entry of every non-None payload a Pool.imap iterator
+        yields, writing on time while the pool is still busy."""
+        while True:
+            try:
+                entry = results.next(self.timeout())
+            except StopIteration:
+                return
+            except multiprocessing.TimeoutError:
+                self.tick()
+                continue
+            if entry is not None:
+                self.add(payload_to_entry(entry))
+
+    def flush(self) -> int:
+        batch, self._buf = self._buf, []
+        self._since = time.monotonic()
+        if not batch:
+            return 0
+        n = update_entries(self.session, batch)
+        self.written += n
+        if n and self.on_flush:
+            self.on_flush(batch)
+        return n
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.flush()
+        return False
+
+def _by_priority():
+    return (Video.priority.desc(), Video.inserted_at.asc())
+
+def _retry_due(now: str):
+    return or_(Video.next_retry_at.is_(None), Video.next_retry_at <= now)
 
 def get_undownloaded(session, source_url: str, limit: int) -> list:
+    now = datetime.now().isoformat(timespec="seconds")
+    q = (
+        session.query(Video)
+        .filter(Video.source == source_url, Video.stage == "download", _retry_due(now))
+        .order_by(*_by_priority())
+    )
+    if limit:
+        q = q.limit(limit)
+    return q.all()
+
+def get_retry_due(session, source_urls: list[str], limit: int) -> list:
+    """Downloads whose retry time (backoff, or off-peak start) has come, for
+    sources not being listed now."""
+    if not source_urls:
+        return []
+    now = datetime.now().isoformat(timespec="seconds")
     q = (
         session.query(Video)
-        .filter(Video.downloaded == 0, Video.source == source_url)
-        .order_by(Video.inserted_at.asc())  # Oldest first
+        .filter(Video.source.in_(source_urls), Video.stage == "download",
+                Video.next_retry_at <= now)
+        .order_by(*_by_priority())
     )
     if limit:
         q = q.limit(limit)
     return q.all()
 
+def next_retry_due(session, source_urls: list[str]) -> float | None:
+    """Epoch of the earliest pending download retry among `source_urls`, or None.
+    Entries held for off-peak hours count from the window's start, so they
+    don't keep the download stage waking meanwhile."""
+    if not source_urls:
+        return None
+    (at,) = session.query(func.min(Video.next_retry_at)).filter(
+        Video.source.in_(source_urls), Video.stage == "download",
+        Video.next_retry_at.isnot(None),
+    ).one()
+    try:
+        return datetime.fromisoformat(at).timestamp() if at else None
+    except ValueError:
+        return None
+
 def get_untranscribed(session, limit: int):
+    now = datetime.now().isoformat(timespec="seconds")
     q = (
         session.query(Video)
-        .filter(Video.downloaded == 1, Video.transcribed == 0)
-        .order_by(Video.inserted_at.asc())  # Oldest first
+        .filter(Video.stage == "transcribe", _retry_due(now))  # off-peak holds wait out of the batch
+        .order_by(*_by_priority())
     )
     if limit:
         q = q.limit(limit)
@@ -312,8 +655,8 @@ def get_untranscribed(session, limit: int):
 def get_unsummarized(session, limit: int):
     q = (
         session.query(Video)
-        .filter(Video.downloaded == 1, Video.transcribed == 1, Video.summarized == 0)
-        .order_by(Video.inserted_at.asc())  # Oldest first
+        .filter(Video.stage == "summarize")
+        .order_by(*_by_priority())
     )
     if limit:
         q = q.limit(limit)
@@ -322,11 +665,8 @@ def get_unsummarized(session, limit: int):
 def get_unpushed(session, limit: int):
     q = (
         session.query(Video)
-        .filter(Video.downloaded == 1, 
-                Video.transcribed == 1, 
-                Video.summarized == 1, 
-                Video.pushed == 0)
-        .order_by(Video.inserted_at.asc())  # Oldest first
+        .filter(Video.stage == "push")
+        .order_by(*_by_priority())
     )
     if limit:
         q = q.limit(limit)
@@ -362,3 +702,41 @@ def mark_feedback_applied(session, keys) -> None:
         if fb:
             fb.applied = 1
     session.commit()
+
+def get_known_urls(session) -> dict[str, set[str]]:
+    """source url -> webpage_urls already known for it (stored rows + high-water mark)."""
+    known: dict[str, set[str]] = {}
+    for source, url in session.query(Video.source, Video.webpage_url).all():
+        known.setdefault(source, set()).add(url)
+    for src in session.query(Source).all():
+        if src.high_water:
+            known.setdefault(src.url, set()).add(src.high_water)
+    return known
+
+def get_source_states(session) -> dict[str, dict]:
+    """source url -> its listing state (every sources column except url)."""
+    cols = [c.key for c in inspect(Source).mapper.column_attrs if c.key != "url"]
+    return {s.url: {k: getattr(s, k) for k in cols} for s in session.query(Source).all()}
+
+def save_source_state(session, source_url: str, state: dict) -> None:
+    src = session.get(Source, source_url)
+    if src is None:
+        src = Source(url=source_url)
+        session.add(src)
+    for c in inspect(Source).mapper.column_attrs:
+        if c.key != "url" and c.key in state:
+            setattr(src, c.key, state[c.key])
+    session.commit()
+
+def next_poll_due(session, urls: list[str]) -> float | None:
+    """Earliest next_due among `urls` (0.0 if one was never polled); None if no urls."""
+    if not urls:
+        return None
+    due = dict(session.query(Source.url, Source.next_due).filter(Source.url.in_(urls)).all())
+    return min(due.get(u) or 0.0 for u in urls)
+
+def get_upload_dates(session, source_url: str) -> list[str]:
+    rows = session.query(Video.upload_date).filter(
+        Video.source == source_url, Video.upload_date.isnot(None)
+    ).all()
+    return [r[0] for r in rows if r[0]]
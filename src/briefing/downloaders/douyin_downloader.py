@@ -7,9 +7,16 @@ user's homepage posts and resolve no-watermark video URLs.
 
 Public surface (used by downloader.py):
     is_douyin(url) -> bool
-    fetch_homepage_entries(source_url, limit) -> list[dict]   # normalized entries
+    fetch_homepage_entries(source_url, limit, known, state) -> list[dict]
+    resolve_direct_urls(webpage_urls) -> dict[str, str|None]  # concurrent resolve
     download_to(webpage_url, out_path_no_ext) -> Path | None  # saves a video file
 
+All f2 calls share one client session: a single event loop on a background
+thread (callers on any thread block on run_coroutine_threadsafe) and one
+DouyinHandler, rebuilt only when cookies.txt changes. Calls from several
+download threads therefore run concurrently on that loop, at most
+_MAX_TASKS at a time.
+
 Self-test (run inside the `briefing` conda env):
     python douyin_downloader.py <homepage_url>          # list posts
     python douyin_downloader.py video <video_url>       # resolve + show direct url
@@ -18,26 +25,61 @@ Self-test (run inside the `briefing` conda env):
 from __future__ import annotations
 
 import asyncio
+import atexit
 import hashlib
+import heapq
 import json
+import os
+import subprocess
+import sys
+import threading
 from datetime import datetime
-from http.cookiejar import MozillaCookieJar
 from pathlib import Path
 
-import requests
-
-from briefing.config import COOKIES_TXT, AUDIO_DIR, DATA_DIR
+from briefing.config import AUDIO_DIR, DATA_DIR, FFMPEG_BIN, DOUYIN_MEDIA
+from briefing.cookies import cookie_manager
+from briefing.downloaders import http_engine
+from briefing.downloaders.limits import Meter
 
 import logging
 
-def _quiet_f2() -> None:
-    logging.getLogger("f2").setLevel(logging.CRITICAL)  # silence F2's verbose logging
+_quiet_modules: set[str] = set()   # f2 modules whose consoles are already quiet
+_quiet_seen = 0                    # len(sys.modules) at the last scan
+
+
+def _quiet_f2(*extra) -> None:
+    """Silence F2 itself: its logger, and the rich consoles it prints page
+    headers on. Never the process streams, which other threads write to.
+    Modules are only scanned when new ones were imported since the last call;
+    `extra` are freshly created f2 objects that may hold a console."""
+    global _quiet_seen
+    log = logging.getLogger("f2")
+    log.setLevel(logging.CRITICAL)  # silence F2's verbose logging
+    log.propagate = False
+    try:
+        from rich.console import Console
+    except ImportError:
+        return
+    objs = list(log.handlers) + list(extra)
+    if len(sys.modules) != _quiet_seen:
+        _quiet_seen = len(sys.modules)
+        for name, mod in list(sys.modules.items()):
+            if mod is None or name in _quiet_modules or not (name == "f2" or name.startswith("f2.")):
+                continue
+            _quiet_modules.add(name)
+            objs.extend(vars(mod).values())
+    for obj in objs:
+        console = getattr(obj, "console", obj)  # RichHandler / Console
+        if isinstance(console, Console):
+            console.quiet = True
 
 _quiet_f2()
 
 # On-disk cache of fresh direct URLs captured during homepage listing, so the
 # later download phase can reuse them instead of calling the Douyin API again.
 _URL_CACHE = DATA_DIR / ".douyin_urls.json"
+# Cache key suffix for a post's audio-only rendition (when the API offers one).
+_AUDIO_KEY = ":audio"
 
 # f2 imports are deferred into functions so importing this module never hard-fails
 # if f2 isn't installed in a given environment (e.g. the YouTube-only path).
@@ -77,67 +119,133 @@ def _url_exp(direct_url: str) -> int:
     return int(datetime.now().timestamp()) + 3600
 
 
-def _cache_load() -> dict:
-    try:
-        return json.loads(_URL_CACHE.read_text(encoding="utf-8"))
-    except Exception:
-        return {}
+class _UrlCache:
+    """The direct-url cache, held in memory and shared by listing and download
+    threads. The file is read once; writes are batched (every _FLUSH_EVERY
+    changes or _FLUSH_SECONDS) and atomic (tmp file + rename), with a final
+    flush at exit. Expired entries leave via a heap ordered by expiry."""
 
+    _FLUSH_EVERY = 50
+    _FLUSH_SECONDS = 30
 
-def _cache_save(d: dict) -> None:
-    try:
-        _URL_CACHE.parent.mkdir(parents=True, exist_ok=True)
-        _URL_CACHE.write_text(json.dumps(d, ensure_ascii=False), encoding="utf-8")
-    except Exception:
-        pass
+    def __init__(self, path: Path):
+        self._path = path
+        self._lock = threading.Lock()
+        self._data: dict | None = None   # video_id -> {"url", "exp"}
+        self._heap: list = []            # (exp, video_id), may hold stale pairs
+        self._dirty = 0
+        self._flushed_at = 0.0
+
+    def _loaded(self) -> dict:
+        if self._data is None:
+            try:
+                self._data = json.loads(self._path.read_text(encoding="utf-8"))
+            except Exception:
+                self._data = {}
+            self._heap = [(rec.get("exp", 0), vid) for vid, rec in self._data.items()]
+            heapq.heapify(self._heap)
+            self._flushed_at = datetime.now().timestamp()
+        return self._data
+
+    def _expire(self, now: float) -> None:
+        while self._heap and self._heap[0][0] <= now:
+            exp, vid = heapq.heappop(self._heap)
+            rec = self._data.get(vid)
+            if rec and rec.get("exp", 0) == exp:  # not since replaced by a fresher URL
+                del self._data[vid]
+                self._dirty += 1
+
+    def put(self, video_id: str, direct_url: str) -> None:
+        exp = _url_exp(direct_url)
+        with self._lock:
+            self._loaded()[video_id] = {"url": direct_url, "exp": exp}  # overwrite = dedup
+            heapq.heappush(self._heap, (exp, video_id))
+            self._dirty += 1
+            now = datetime.now().timestamp()
+            self._expire(now)
+            due = self._dirty >= self._FLUSH_EVERY or now - self._flushed_at >= self._FLUSH_SECONDS
+        if due:
+            self.flush()
+
+    def get(self, video_id: str) -> str | None:
+        with self._lock:
+            rec = self._loaded().get(video_id)
+            now = datetime.now().timestamp()
+            if rec and rec.get("exp", 0) > now + 60:  # 60s safety margin
+                return rec.get("url")
+            self._expire(now)
+            return None
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._data is None or not self._dirty:
+                return
+            text = json.dumps(self._data, ensure_ascii=False)
+            self._dirty = 0
+            self._flushed_at = datetime.now().timestamp()
+            try:
+                self._path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = self._path.with_suffix(".tmp")
+                tmp.write_text(text, encoding="utf-8")
+                os.replace(tmp, self._path)
+            except Exception:
+                pass
+
+
+_url_cache = _UrlCache(_URL_CACHE)
+atexit.register(_url_cache.flush)
 
 
 def cache_put(video_id: str, direct_url: str) -> None:
     if not video_id or not direct_url:
         return
-    d = _cache_load()
-    now = int(datetime.now().timestamp())
-    # garbage-collect expired entries on every write so the file stays bounded
-    d = {k: v for k, v in d.items() if v.get("exp", 0) > now}
-    d[video_id] = {"url": direct_url, "exp": _url_exp(direct_url)}  # overwrite = dedup
-    _cache_save(d)
+    _url_cache.put(video_id, direct_url)
 
 
 def cache_get(video_id: str) -> str | None:
-    """Return a still-valid cached URL, or None. Prunes expired entries."""
-    d = _cache_load()
-    rec = d.get(video_id)
-    now = int(datetime.now().timestamp())
-    if rec and rec.get("exp", 0) > now + 60:  # 60s safety margin
-        return rec.get("url")
-    if rec:                                    # expired -> drop it
-        d.pop(video_id, None)
-        _cache_save(d)
-    return None
+    """Return a still-valid cached URL, or None."""
+    return _url_cache.get(video_id)
+
+
+def cache_flush() -> None:
+    """Write pending cache changes now (end of a download pass)."""
+    _url_cache.flush()
+
+
+# f2's max_tasks; also caps concurrent calls on the shared loop.
+_MAX_TASKS = 5
+
+_cookie_lock = threading.Lock()
+_cookie_cache: tuple | None = None  # (cookie_manager.version, header)
 
 
 def _load_cookie() -> str:
-    """Build a 'k=v; k=v' Cookie header from cookies.txt (Mozilla format,
-    filtered to douyin.com). Returns "" if none found."""
-    cookies_txt = COOKIES_TXT
-    if cookies_txt.exists():
-        try:
-            jar = MozillaCookieJar()
-            jar.load(str(cookies_txt), ignore_discard=True, ignore_expires=True)
-            douyin = [c for c in jar if "douyin.com" in (c.domain or "")]
-            auth = [c for c in douyin if c.name in ("sessionid", "sessionid_ss", "sid_guard")]
-            if not auth or all(c.is_expired() for c in auth):
-                print("[douyin] WARNING: login cookies missing/expired")
-            parts = [f"{c.name}={c.value}" for c in douyin]
-            if parts:
-                return "; ".join(parts)
-        except Exception:
-            pass
+    """Douyin Cookie header from the shared jar, rebuilt only when it changed."""
+    global _cookie_cache
+    with _cookie_lock:
+        jar = cookie_manager.jar()
+        if _cookie_cache is None or _cookie_cache[0] != cookie_manager.version:
+            _cookie_cache = (cookie_manager.version, _parse_cookie(jar))
+        return _cookie_cache[1]
+
+
+def _parse_cookie(jar) -> str:
+    """Build a 'k=v; k=v' Cookie header from the jar's douyin.com cookies.
+    Returns "" if none found."""
+    try:
+        douyin = [c for c in jar if "douyin.com" in (c.domain or "")]
+        auth = [c for c in douyin if c.name in ("sessionid", "sessionid_ss", "sid_guard")]
+        if not auth or all(c.is_expired() for c in auth):
+            print("[douyin] WARNING: login cookies missing/expired")
+        parts = [f"{c.name}={c.value}" for c in douyin]
+        if parts:
+            return "; ".join(parts)
+    except Exception:
+        pass
     return ""
 
 
-def _build_kwargs() -> dict:
-    cookie = _load_cookie()
+def _build_kwargs(cookie: str) -> dict:
     if not cookie:
         print("[douyin] WARNING: no Douyin cookie found in cookies.txt. "
               "Homepage listing may fail.")
@@ -148,7 +256,7 @@ def _build_kwargs() -> dict:
         "timeout": 20,
         "max_retries": 3,
         "max_connections": 5,
-        "max_tasks": 5,
+        "max_tasks": _MAX_TASKS,
         # download-side keys f2's DouyinDownloader expects to exist; we don't use
         # f2's downloader, but the handler constructs one at init.
         "mode": "post",
@@ -164,17 +272,50 @@ def _build_kwargs() -> dict:
     }
 
 
+# --------------------------------------------------------------------------- #
+# shared client session: one loop thread, one handler
+# --------------------------------------------------------------------------- #
+_loop: asyncio.AbstractEventLoop | None = None
+_loop_lock = threading.Lock()
+_handler_obj = None
+_handler_cookie: str | None = None
+_sem: asyncio.Semaphore | None = None
+
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="douyin-loop", daemon=True).start()
+            _loop = loop
+        return _loop
+
+
 def _handler():
-    from f2.apps.douyin.handler import DouyinHandler
-    _quiet_f2()  # re-apply: F2 resets its logger level on init
-    return DouyinHandler(_build_kwargs())
+    """The shared DouyinHandler; only ever called on the loop thread."""
+    global _handler_obj, _handler_cookie
+    cookie = _load_cookie()
+    if _handler_obj is None or cookie != _handler_cookie:
+        from f2.apps.douyin.handler import DouyinHandler
+        _handler_obj = DouyinHandler(_build_kwargs(cookie))
+        _handler_cookie = cookie
+        _quiet_f2(_handler_obj)  # re-apply: F2 resets its logger level on init, and its modules are loaded now
+    return _handler_obj
+
+
+async def _limited(coro):
+    global _sem
+    if _sem is None:
+        _sem = asyncio.Semaphore(_MAX_TASKS)  # created on the loop thread
+    async with _sem:
+        return await coro
 
 
 def _run(coro):
-    # F2 prints page headers via a rich console (stdout); send all its output to the void.
-    import os, contextlib
-    with open(os.devnull, "w") as _null, contextlib.redirect_stdout(_null), contextlib.redirect_stderr(_null):
-        return asyncio.run(coro)
+    """Run `coro` on the shared loop and wait for its result."""
+    _quiet_f2()  # f2 modules imported since the last call bring their own consoles
+    return asyncio.run_coroutine_threadsafe(_limited(coro), _get_loop()).result()
 
 
 def _find_play_url(obj) -> str | None:
@@ -215,6 +356,43 @@ def _find_play_url(obj) -> str | None:
     return best
 
 
+def _find_audio_url(obj) -> str | None:
+    """An audio-only rendition URL (bit_rate_audio / audio_meta) if the f2
+    result carries one. `music` is skipped: that is the post's background
+    track, not its soundtrack."""
+    found: str | None = None
+
+    def first_url(node):
+        if isinstance(node, str):
+            return node if node.startswith("http") else None
+        items = node.values() if isinstance(node, dict) else node if isinstance(node, (list, tuple)) else ()
+        for v in items:
+            u = first_url(v)
+            if u:
+                return u
+        return None
+
+    def visit(node):
+        nonlocal found
+        if found:
+            return
+        if isinstance(node, dict):
+            for k, v in node.items():
+                if k == "music":
+                    continue
+                if k in ("bit_rate_audio", "audio_meta", "audio_play_addr") and v:
+                    found = first_url(v)
+                    if found:
+                        return
+                visit(v)
+        elif isinstance(node, (list, tuple)):
+            for v in node:
+                visit(v)
+
+    visit(obj)
+    return found
+
+
 def _to_dict(filter_obj) -> dict:
     for attr in ("_to_dict", "to_dict"):
         fn = getattr(filter_obj, attr, None)
@@ -279,59 +457,140 @@ def _create_ts(item) -> int:
 # --------------------------------------------------------------------------- #
 # public: list a homepage's recent posts
 # --------------------------------------------------------------------------- #
-async def _afetch_homepage_entries(source_url: str, limit: int) -> list[dict]:
+def _entry_from_item(item: dict, source_url: str) -> dict | None:
+    aweme_id = (
+        item.get("aweme_id")
+        or item.get("awemeId")
+        or item.get("aweme_id_str")
+    )
+    if not aweme_id:
+        return None
+    ts = _create_ts(item)
+    webpage_url = f"https://www.douyin.com/video/{aweme_id}"
+    return {
+        "source": source_url,
+        "extractor": "douyin",
+        "upload_date": _time_format_douyin(ts),
+        "duration": _ms_to_sec(item.get("video_duration")),
+        "language": None,
+        "title": item.get("desc_raw") or item.get("desc") or item.get("title") or aweme_id,
+        "webpage_url": webpage_url,
+        "video_id": _make_video_id(webpage_url),
+        "_ts": ts,
+        "_top": bool(item.get("is_top")),
+        "_play": _find_play_url(item),
+        "_audio": _find_audio_url(item),
+    }
+
+
+def _page_entries(page, source_url: str) -> list[dict]:
+    return [e for e in (_entry_from_item(i, source_url) for i in _to_list(page)) if e]
+
+
+def _page_cursor(page) -> tuple[int | None, bool]:
+    """(max_cursor of the next page, has_more) from an f2 UserPostFilter."""
+    d = _to_dict(page)
+    cursor = getattr(page, "max_cursor", None) or d.get("max_cursor")
+    has_more = getattr(page, "has_more", None)
+    if has_more is None:
+        has_more = d.get("has_more")
+    try:
+        return (int(cursor) if cursor else None), bool(has_more)
+    except (TypeError, ValueError):
+        return None, False
+
+
+# Catch-up paging after downtime: at most this many older pages per poll; the
+# rest continues from the saved cursor on the next poll.
+_BACKFILL_PAGE = 20
+_BACKFILL_PAGES = 5
+
+
+async def _afetch_homepage_entries(source_url: str, limit: int,
+                                   known: set | None = None,
+                                   state: dict | None = None) -> list[dict]:
     from f2.apps.douyin.utils import SecUserIdFetcher
 
-    sec_uid = await SecUserIdFetcher.get_sec_user_id(source_url)
+    state = state if state is not None else {}
+    known = known or set()
+    sec_uid = state.get("sec_uid")
+    if not sec_uid:
+        sec_uid = await SecUserIdFetcher.get_sec_user_id(source_url)
+        state["sec_uid"] = sec_uid  # persisted with the source; resolved once
     handler = _handler()
 
     # Pinned (is_top, cap 3) posts come first and can be old; pull limit+3 in one
     # request (break after page 1), then sort by create_time and keep newest `limit`.
     fetch_n = limit + 3
-    raw_items: list = []
+    first: list[dict] = []
+    cursor, has_more = None, False
     async for page in handler.fetch_user_post_videos(
         sec_uid, page_counts=fetch_n, max_counts=fetch_n
     ):
-        raw_items = _to_list(page)
+        first = _page_entries(page, source_url)
+        cursor, has_more = _page_cursor(page)
         break
-
-    entries: list[dict] = []
-    for item in raw_items:
-        aweme_id = (
-            item.get("aweme_id")
-            or item.get("awemeId")
-            or item.get("aweme_id_str")
-        )
-        if not aweme_id:
-            continue
-        ts = _create_ts(item)
-        webpage_url = f"https://www.douyin.com/video/{aweme_id}"
-        entries.append({
-            "source": source_url,
-            "extractor": "douyin",
-            "upload_date": _time_format_douyin(ts),
-            "duration": _ms_to_sec(item.get("video_duration")),
-            "language": None,
-            "title": item.get("desc_raw") or item.get("desc") or item.get("title") or aweme_id,
-            "webpage_url": webpage_url,
-            "video_id": _make_video_id(webpage_url),
-            "_ts": ts,
-            "_play": _find_play_url(item),
-        })
+    first.sort(key=lambda e: e["_ts"], reverse=True)
+    entries = first[:limit]
+
+    # A routine poll ends here: page 1 reaches back into known posts. If none of
+    # its (unpinned) posts is known, posts were missed while we were down, so
+    # page back until known ones show up, a few pages per poll. A saved cursor
+    # means an earlier catch-up is still going.
+    gap = bool(known) and has_more and not any(
+        e["webpage_url"] in known for e in first if not e["_top"]
+    )
+    if gap:
+        # page 1 itself held more than `limit`; its older posts are missed too
+        entries += [e for e in first[limit:] if not e["_top"] and e["webpage_url"] not in known]
+    start = cursor if gap else state.get("cursor")
+    if start:
+        seen = {e["webpage_url"] for e in entries}
+        pages = 0
+        async for page in handler.fetch_user_post_videos(
+            sec_uid, max_cursor=start, page_counts=_BACKFILL_PAGE,
+            max_counts=_BACKFILL_PAGE * _BACKFILL_PAGES,
+        ):
+            pages += 1
+            items = [e for e in _page_entries(page, source_url) if not e["_top"]]
+            new = [e for e in items if e["webpage_url"] not in known and e["webpage_url"] not in seen]
+            entries.extend(new)
+            seen.update(e["webpage_url"] for e in new)
+            start, more = _page_cursor(page)
+            if len(new) < len(items) or not more:
+                start = None  # reached known posts / the end of the homepage
+                break
+            if pages >= _BACKFILL_PAGES:
+                break
+        state["cursor"] = start
+    if entries[limit:]:
+        print(f"[douyin] backfilled {len(entries) - limit} older posts from {source_url}")
+
+    # Posts whose list item carried no play URL are resolved together now, so
+    # the download phase finds every URL cached.
+    missing = [e["webpage_url"] for e in entries if not e["_play"]]
+    if missing:
+        resolved = await _aresolve_many(missing)
+        for e in entries:
+            e["_play"] = e["_play"] or resolved.get(e["webpage_url"])
 
     entries.sort(key=lambda e: e["_ts"], reverse=True)
-    entries = entries[:limit]
     for e in entries:
         cache_put(e["video_id"], e.pop("_play"))
+        cache_put(e["video_id"] + _AUDIO_KEY, e.pop("_audio"))
         e.pop("_ts", None)
+        e.pop("_top", None)
 
     return entries
 
 
-def fetch_homepage_entries(source_url: str, limit: int) -> list[dict]:
-    """Return up to `limit` normalized entries from a Douyin user homepage."""
+def fetch_homepage_entries(source_url: str, limit: int, known: set | None = None,
+                           state: dict | None = None) -> list[dict]:
+    """Return normalized entries from a Douyin user homepage, newest first: the
+    newest `limit`, plus older posts missed during downtime when `known` shows a
+    gap. `state` (the source's sources row) carries sec_uid and the catch-up cursor."""
     try:
-        entries = _run(_afetch_homepage_entries(source_url, limit))
+        entries = _run(_afetch_homepage_entries(source_url, limit, known, state))
         print(f"[douyin] fetched {len(entries)} entries from {source_url}")
         return entries
     except Exception as e:
@@ -347,8 +606,26 @@ async def _aresolve_direct_url(webpage_url: str) -> str | None:
 
     aweme_id = await AwemeIdFetcher.get_aweme_id(webpage_url)
     handler = _handler()
-    detail = await handler.fetch_one_video(aweme_id)
-    return _find_play_url(_to_dict(detail))
+    detail = _to_dict(await handler.fetch_one_video(aweme_id))
+    audio = _find_audio_url(detail)
+    if audio:
+        cache_put(_make_video_id(webpage_url) + _AUDIO_KEY, audio)
+    return _find_play_url(detail)
+
+
+async def _aresolve_many(webpage_urls: list[str]) -> dict[str, str | None]:
+    # Own semaphore: the caller already holds one of the shared _limited slots.
+    sem = asyncio.Semaphore(_MAX_TASKS)
+
+    async def one(url):
+        async with sem:
+            try:
+                return await _aresolve_direct_url(url)
+            except Exception:
+                return None
+
+    found = await asyncio.gather(*(one(u) for u in webpage_urls))
+    return dict(zip(webpage_urls, found))
 
 
 def resolve_direct_url(webpage_url: str) -> str | None:
@@ -359,6 +636,19 @@ def resolve_direct_url(webpage_url: str) -> str | None:
         return None
 
 
+def resolve_direct_urls(webpage_urls: list[str]) -> dict[str, str | None]:
+    """Resolve many videos at once (up to _MAX_TASKS in flight) and cache them."""
+    try:
+        found = _run(_aresolve_many(list(webpage_urls)))
+    except Exception as e:
+        print(f"[douyin] batch resolve failed: {type(e).__name__}")
+        return {}
+    for url, direct in found.items():
+        if direct:
+            cache_put(_make_video_id(url), direct)
+    return found
+
+
 def _pick_ext(direct_url: str, content_type: str) -> str:
     """Choose a file extension from the resolved URL / Content-Type.
 
@@ -374,11 +664,15 @@ def _pick_ext(direct_url: str, content_type: str) -> str:
     return ".mp4"
 
 
-def _stream_to(direct_url: str, out_path_no_ext: Path) -> Path | None:
+def _stream_to(direct_url: str, out_path_no_ext: Path,
+               meter: Meter | None = None, part_tag: str = "") -> Path | None:
     """Stream a known direct URL (CDN, not the Douyin API) to disk.
 
     No Douyin API call here — this is the cheap, ban-safe step. Extension
     follows the source: a direct mp3 stays mp3, otherwise mp4. No transcoding.
+    Bytes go through http_engine into <out>.part, which survives a failure so
+    the next attempt (even with a re-resolved URL) resumes instead of starting
+    over. Bytes are charged to `meter` (and so to the shared bandwidth budget).
     Returns the saved Path, else None.
     """
     headers = {"User-Agent": _UA, "Referer": "https://www.douyin.com/"}
@@ -386,64 +680,109 @@ def _stream_to(direct_url: str, out_path_no_ext: Path) -> Path | None:
     if cookie:
         headers["Cookie"] = cookie
 
-    out_path: Path | None = None
+    part = Path(str(out_path_no_ext) + part_tag + ".part")  # one per rendition, never mixed
     try:
-        with requests.get(direct_url, headers=headers, stream=True, timeout=60) as r:
-            r.raise_for_status()
-            ext = _pick_ext(direct_url, r.headers.get("Content-Type", ""))
-            out_path = Path(str(out_path_no_ext) + ext)
-            out_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(out_path, "wb") as f:
-                for chunk in r.iter_content(chunk_size=1 << 16):
-                    if chunk:
-                        f.write(chunk)
+        content_type = http_engine.fetch(direct_url, part, headers, meter)
+    except http_engine.LinkExpired:
+        print("[douyin] direct url expired")
+        return None
     except Exception as e:
         print(f"[douyin] download failed: {type(e).__name__}")
-        if out_path and out_path.exists():
-            try:
-                out_path.unlink()
-            except Exception:
-                pass
         return None
 
-    if out_path and out_path.exists() and out_path.stat().st_size > 100 * 1024:
+    out_path = Path(str(out_path_no_ext) + _pick_ext(direct_url, content_type))
+    if part.exists() and part.stat().st_size > 100 * 1024:  # fetch may leave no file (empty body)
+        os.replace(part, out_path)
         return out_path
+    part.unlink(missing_ok=True)
 
     print("[douyin] file too small / missing")
     return None
 
 
+def _extract_audio(direct_url: str, out_path_no_ext: Path,
+                   meter: Meter | None = None) -> Path | None:
+    """Let ffmpeg read the post straight from the CDN and keep only its audio
+    stream (stream copy, AAC -> .m4a), so the video track never hits the disk.
+    The meter is charged the saved size afterwards; ffmpeg's own reads are not
+    throttled by the bandwidth budget."""
+    if not FFMPEG_BIN:
+        return None
+    headers = f"User-Agent: {_UA}\r\nReferer: https://www.douyin.com/\r\n"
+    cookie = _load_cookie()
+    if cookie:
+        headers += f"Cookie: {cookie}\r\n"
+
+    out_path = Path(str(out_path_no_ext) + ".m4a")
+    # a partial suffix, so import_external_entries never picks up an unfinished file
+    tmp = Path(str(out_path_no_ext) + ".audio.m4a.part")
+    cmd = [
+        str(FFMPEG_BIN), "-hide_banner", "-loglevel", "error", "-y",
+        "-headers", headers, "-i", direct_url,
+        "-vn", "-c:a", "copy", "-f", "ipod", str(tmp),  # ipod = .m4a; the suffix can't tell ffmpeg
+    ]
+    try:
+        tmp.parent.mkdir(parents=True, exist_ok=True)
+        subprocess.run(cmd, check=True, timeout=30 * 60,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    except Exception as e:
+        print(f"[douyin] audio extract failed: {type(e).__name__}")
+        tmp.unlink(missing_ok=True)
+        return None
+
+    size = tmp.stat().st_size if tmp.exists() else 0
+    if size < 20 * 1024:
+        tmp.unlink(missing_ok=True)
+        return None
+    os.replace(tmp, out_path)
+    if meter:
+        meter.add(size)
+    return out_path
+
+
+def _fetch_cached(video_id: str, out_path_no_ext: Path, meter: Meter | None) -> Path | None:
+    """Download from whatever URLs the cache holds for the post (0 API calls).
+    In audio mode: audio rendition, else ffmpeg audio extraction, else the mp4."""
+    video = cache_get(video_id)
+    if DOUYIN_MEDIA == "audio":
+        audio = cache_get(video_id + _AUDIO_KEY)
+        saved = _stream_to(audio, out_path_no_ext, meter, ".audio") if audio else None
+        if not saved and video:
+            saved = _extract_audio(video, out_path_no_ext, meter)
+        if saved:
+            return saved
+    return _stream_to(video, out_path_no_ext, meter) if video else None
+
+
 def download_to(webpage_url: str, out_path_no_ext: Path,
-                video_id: str | None = None) -> Path | None:
-    """Download a Douyin video to <out_path_no_ext>.<ext>.
+                video_id: str | None = None, meter: Meter | None = None) -> Path | None:
+    """Download a Douyin post to <out_path_no_ext>.<ext> (audio only when
+    DOUYIN_MEDIA is "audio").
 
-    Request budget: tries the cached direct URL first (captured during homepage
+    Request budget: tries the cached direct URLs first (captured during homepage
     listing -> 0 API calls). Only if the cache misses or the cached URL has
     expired do we fall back to one fetch_one_video API call to re-resolve.
     """
     video_id = video_id or _make_video_id(webpage_url)
 
-    cached = cache_get(video_id)
-    if cached:
-        saved = _stream_to(cached, out_path_no_ext)
+    if cache_get(video_id) or cache_get(video_id + _AUDIO_KEY):
+        saved = _fetch_cached(video_id, out_path_no_ext, meter)
         if saved:
             return saved
         print("[douyin] cached url failed/expired -> re-resolving via API")
 
-    direct = resolve_direct_url(webpage_url)
+    direct = resolve_direct_url(webpage_url)  # also caches an audio rendition
     if not direct:
         print(f"[douyin] no direct url for {webpage_url}")
         return None
     cache_put(video_id, direct)
-    return _stream_to(direct, out_path_no_ext)
+    return _fetch_cached(video_id, out_path_no_ext, meter)
 
 
 # --------------------------------------------------------------------------- #
 # self-test
 # --------------------------------------------------------------------------- #
 if __name__ == "__main__":
-    import sys
-
     if len(sys.argv) < 2:
         print(__doc__)
         sys.exit(0)
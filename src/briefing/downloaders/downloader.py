@@ -1,13 +1,22 @@
 from yt_dlp import YoutubeDL
-from datetime import datetime
-from http.cookiejar import MozillaCookieJar
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime, timedelta
+from pathlib import Path
 import hashlib
 import json
-
-from briefing.config import AUDIO_DIR, ENTRIES_LIMIT, SOURCE_URLS, UPDATE_LIMIT, PENDING_FILE, COOKIES_TXT, FFMPEG_BIN
-from briefing.cookies import _SilentLogger
-from briefing.db import Video, update_entries, init_entries, get_undownloaded, get_entries_by_ids, save_entries
-from . import douyin_downloader
+import threading
+import time
+
+from briefing import scheduler
+from briefing.admission import admit, hold
+from briefing.config import AUDIO_DIR, ENTRIES_LIMIT, SOURCE_URLS, UPDATE_LIMIT, PENDING_FILE, FFMPEG_BIN, DOWNLOAD_WORKERS, AUDIO_FORMAT, SUBTITLES, OUTPUT_DIR
+from briefing.cookies import _SilentLogger, cookie_manager
+from briefing.db import AUDIO_SUFFIXES, Video, BatchWriter, init_entries, get_undownloaded, get_entries_by_ids, save_entries, entry_to_payload, payload_to_entry
+from briefing.db import get_known_urls, get_source_states, save_source_state, get_upload_dates, get_retry_due, delete_partials
+from . import douyin_downloader, youtube_feed, subtitles
+from .polling import plan_poll
+from .limits import platform, platform_slot, Meter
+from .strategies import STRATEGIES, strategy_cache
 
 # ENTRIES_LIMIT is the yt-dlp "1-x" string; Douyin needs the plain integer cap.
 try:
@@ -15,51 +24,186 @@ try:
 except Exception:
     _ENTRIES_LIMIT_INT = 10
 
-_cookie_jar = MozillaCookieJar()
-_cookies_txt = COOKIES_TXT
-if _cookies_txt.exists():
-    try:
-        _cookie_jar.load(str(_cookies_txt), ignore_discard=True, ignore_expires=True)
-    except Exception:
-        pass
+# Listing threads across all platforms; limits.LIST_LIMITS caps each platform.
+_LIST_WORKERS = 8
+
+# Failed downloads back off 10 min, 20 min, 40 min ... up to a day, and are
+# given up on ("dead") after _MAX_ATTEMPTS, or at once when every strategy
+# failed with an error that no retry can fix.
+_RETRY_BASE = 10 * 60
+_RETRY_CAP = 24 * 60 * 60
+_MAX_ATTEMPTS = 8
+_PERMANENT_ERRORS = (
+    "private video", "members-only", "join this channel", "video unavailable",
+    "has been removed", "account associated with this video has been terminated",
+    "not available in your country", "geo restriction", "geo-restricted",
+    "http error 404", "http error 410", "unsupported url", "does not exist",
+)
+
+def _is_permanent(error: str | None) -> bool:
+    msg = (error or "").lower()
+    return any(p in msg for p in _PERMANENT_ERRORS)
+
+def _schedule_retry(entry: Video) -> None:
+    """Count a failed download and set when (or whether) to try it again."""
+    entry.download_attempts = (entry.download_attempts or 0) + 1
+    if entry.dead or entry.download_attempts >= _MAX_ATTEMPTS:
+        entry.dead = 1
+        entry.next_retry_at = None
+        return
+    delay = min(_RETRY_BASE * 2 ** (entry.download_attempts - 1), _RETRY_CAP)
+    entry.next_retry_at = (datetime.now() + timedelta(seconds=delay)).isoformat(timespec="seconds")
 
 def _inject(ydl: YoutubeDL) -> None:
-    for c in _cookie_jar:
+    for c in cookie_manager.jar():
         ydl.cookiejar.set_cookie(c)
 
+# YoutubeDL instances are reused across entries within a pass: one per
+# (thread, purpose, strategy), since an instance is not safe to share between
+# threads. _close_ydls() ends the pass; bumping the generation makes any
+# surviving thread build fresh ones (with fresh cookies) next pass.
+_ydl_local = threading.local()
+_ydl_open: list = []
+_ydl_lock = threading.Lock()
+_ydl_gen = 0
+
+def _ydl(purpose: str, name: str, opts: dict) -> YoutubeDL:
+    if getattr(_ydl_local, "gen", None) != _ydl_gen:
+        _ydl_local.gen = _ydl_gen
+        _ydl_local.cache = {}
+    ydl = _ydl_local.cache.get((purpose, name))
+    if ydl is None:
+        extra, inject = STRATEGIES[name]
+        ydl = YoutubeDL({**opts, **extra})
+        if inject:
+            _inject(ydl)
+        _ydl_local.cache[(purpose, name)] = ydl
+        with _ydl_lock:
+            _ydl_open.append(ydl)
+    return ydl
+
+def _close_ydls() -> None:
+    global _ydl_gen
+    with _ydl_lock:
+        opened = list(_ydl_open)
+        _ydl_open.clear()
+        _ydl_gen += 1
+    for ydl in opened:
+        try:
+            ydl.close()
+        except Exception:
+            pass
+    strategy_cache.save()
+
+def _set_outtmpl(ydl: YoutubeDL, outtmpl: str) -> None:
+    # yt-dlp normalizes outtmpl to {"default": ...} at init; swap it per entry.
+    current = ydl.params.get("outtmpl")
+    if isinstance(current, dict):
+        current["default"] = outtmpl
+    else:
+        ydl.params["outtmpl"] = {"default": outtmpl}
+
+def _progress_hook(d: dict) -> None:
+    # One shared hook per reused instance; routes bytes to this thread's meter.
+    meter = getattr(_ydl_local, "meter", None)
+    if meter is not None:
+        meter.ytdlp_hook(d)
+
 def _refresh_cookies() -> None:
-    global _cookie_jar
+    # Cheap when nothing changed: only browsers whose cookie store moved are re-read.
     try:
-        from briefing.cookies import create_cookies_txt
-        create_cookies_txt()
+        cookie_manager.refresh()
     except Exception as e:
         print(f"[cookies] refresh failed: {type(e).__name__}: {e}")
 
-    jar = MozillaCookieJar()
-    if _cookies_txt.exists():
+def _list_source(source_url: str, known: set, state: dict) -> list:
+    with platform_slot(source_url, "list"):
+        return fetch_all_entries(source_url, known, state)
+
+def _download_payload(payload: dict) -> Video:
+    # Runs on a download thread: works on a detached copy, never on the session.
+    entry = payload_to_entry(payload)
+    with platform_slot(entry.webpage_url, "download"):
         try:
-            jar.load(str(_cookies_txt), ignore_discard=True, ignore_expires=True)
-        except Exception:
-            pass
-    _cookie_jar = jar
+            return download_entry(entry)
+        except Exception as e:
+            entry.downloaded = 0
+            entry.download_error = f"{type(e).__name__}: {e}"
+            return entry
+
+def _notify_downloaded(entries: list) -> None:
+    for e in entries:
+        if e.downloaded:
+            scheduler.notify("summarize" if e.transcribed else "transcribe")
+
+def downloader(session, all_sources: bool = False) -> None:
+    """List the sources that are due (every configured one with `all_sources`)
+    and download their new entries."""
+    now = time.time()
+    states = get_source_states(session)
+    for u in SOURCE_URLS:
+        states.setdefault(u, {})
+    due = [u for u in SOURCE_URLS if all_sources or (states[u].get("next_due") or 0.0) <= now]
+    # Sources listed below queue their own due retries via get_undownloaded.
+    retries = admit(session, get_retry_due(session, [u for u in SOURCE_URLS if u not in due], UPDATE_LIMIT))
+    if not due and not retries:
+        return
 
-def downloader(session) -> None:
     _refresh_cookies()
-    for source_url in SOURCE_URLS:
-        entries = fetch_all_entries(source_url)
-        init_entries(session, entries)
-        videos = get_undownloaded(session, source_url, UPDATE_LIMIT)
-
-        ok = 0
-        fail = 0
-        for v in videos:
-            entry = download_entry(v)
-            if entry.downloaded == 0:
-                fail += 1
-            else:
-                ok += 1
-            update_entries(session, [entry])
-        print(f"Download finished: {ok} succeeded, {fail} failed.")
+    # Listing and downloading are network-bound: every due source is listed in
+    # parallel and each listing's new entries go straight onto the download
+    # pool. This thread is the only one touching the DB: it saves listings and
+    # download results as they complete.
+    ok = 0
+    fail = 0
+    held = 0
+    with ThreadPoolExecutor(max_workers=_LIST_WORKERS, thread_name_prefix="list") as lister, \
+         ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS, thread_name_prefix="download") as fetcher, \
+         BatchWriter(session, on_flush=_notify_downloaded) as writer:
+        known = get_known_urls(session)
+        listings = {
+            lister.submit(_list_source, u, known.get(u, set()), states[u]): u
+            for u in due
+        }
+        pending = set(listings)
+        pending.update(fetcher.submit(_download_payload, entry_to_payload(v)) for v in retries)
+        while pending:
+            done, pending = wait(pending, timeout=writer.timeout(), return_when=FIRST_COMPLETED)
+            writer.tick()
+            for fut in done:
+                if fut in listings:
+                    source_url = listings[fut]
+                    try:
+                        entries = fut.result()
+                    except Exception as e:
+                        print(f"{source_url} listing failed: {type(e).__name__}: {e}")
+                        entries = []
+                    new = init_entries(session, entries)
+                    state = states[source_url]
+                    if entries:
+                        state["high_water"] = entries[-1]["webpage_url"]
+                    plan_poll(source_url, state, time.time(), new, state.pop("_ok", bool(entries)),
+                              get_upload_dates(session, source_url))
+                    save_source_state(session, source_url, state)
+                    for v in admit(session, get_undownloaded(session, source_url, UPDATE_LIMIT)):
+                        pending.add(fetcher.submit(_download_payload, entry_to_payload(v)))
+                    continue
+
+                entry = fut.result()
+                if entry.downloaded == 0 and entry.defer_reason:
+                    held += 1  # admission, not a failure: no retry counted
+                elif entry.downloaded == 0:
+                    fail += 1
+                    _schedule_retry(entry)
+                else:
+                    ok += 1
+                    entry.next_retry_at = None
+                if entry.dead:
+                    delete_partials(entry.video_id)  # never resumed now
+                writer.add(entry)
+    _close_ydls()
+    douyin_downloader.cache_flush()
+    print(f"Download finished: {ok} succeeded, {fail} failed, {held} held back.")
 
 
 def make_local_audio_id(filename: str) -> str:
@@ -81,10 +225,19 @@ def _time_format_ytdlp(info) -> str | None:
     ud = str(info.get("upload_date") or info.get("release_date") or "")
     return f"{ud[:4]}-{ud[4:6]}-{ud[6:8]} 00:00:00" if len(ud) == 8 and ud.isdigit() else None
 
-def fetch_all_entries(source_url: str) -> list:
+def fetch_all_entries(source_url: str, known: set | None = None,
+                      state: dict | None = None) -> list:
     '''
     Fetch and normalize video entries from a source URL.
 
+    With `known` (webpage_urls already seen for this source) the listing is
+    incremental: entries are pulled lazily newest-first and paging stops at
+    known content, so only new entries are returned.
+
+    With `state` (the source's row in the sources table, updated in place)
+    YouTube channels/playlists are read from their Atom feed first, and
+    yt-dlp is only used when the feed can't answer.
+
     entry: 
         source            Guaranteed  <-
         extractor         Nullable    <-
@@ -103,12 +256,22 @@ def fetch_all_entries(source_url: str) -> list:
         pushed            Not set here
         video_id          Guaranteed  <-
     '''
-    # Douyin source: use f2 (one request), which also caches the direct URLs.
+    # Douyin source: use f2 (one request per poll, more only to catch up after
+    # downtime), which also caches the direct URLs.
     if douyin_downloader.is_douyin(source_url):
-        entries = douyin_downloader.fetch_homepage_entries(source_url, _ENTRIES_LIMIT_INT)
+        entries = douyin_downloader.fetch_homepage_entries(source_url, _ENTRIES_LIMIT_INT, known, state)
         entries.reverse()  # match the yt-dlp path: old -> new
+        if state is not None:
+            state["_ok"] = bool(entries)  # a homepage always has posts; empty = failed
         return entries
 
+    if state is not None and platform(source_url) == "youtube":
+        entries = _fetch_feed(source_url, known or set(), state)
+        if entries is not None:
+            state["_ok"] = True
+            return entries
+
+    incremental = known is not None
     try:
         ydl_opts = {
             "skip_download": True,
@@ -120,30 +283,31 @@ def fetch_all_entries(source_url: str) -> list:
             "logger": _SilentLogger(),
         }
 
-        _android = {"extractor_args": {"youtube": {"player_client": ["android"]}}}
-        attempts = [
-            ({},        True),
-            (_android,  True),
-            ({},        False),
-        ]
-
         info = None
 
-        for extra, inject in attempts:
+        for name in strategy_cache.order(source_url):
             try:
-                with YoutubeDL({**ydl_opts, **extra}) as ydl:
-                    if inject:
-                        _inject(ydl)
-                    info = ydl.extract_info(source_url, download=False)
-                if info:
-                    break
+                ydl = _ydl("list", name, ydl_opts)
+                # process=False leaves a playlist's entries lazy: yt-dlp requests
+                # the next page only when iteration reaches it.
+                info = ydl.extract_info(source_url, download=False, process=not incremental)
+                if info and info.get("_type") in ("url", "url_transparent"):
+                    info = ydl.process_ie_result(info, download=False)  # e.g. channel -> /videos
             except Exception:
-                continue
+                info = None
+            if info:
+                strategy_cache.success(source_url, name)
+                break
+            strategy_cache.failure(source_url, name)
 
         if not info:
+            if state is not None:
+                state["_ok"] = False
             return []
     except Exception as e:
         print(e)
+        if state is not None:
+            state["_ok"] = False
         return []
    
     raw_entries = info.get("entries")
@@ -151,7 +315,11 @@ def fetch_all_entries(source_url: str) -> list:
         raw_entries = [info]  # Single video
     
     entries = []
+    seen = 0
+    known_run = 0
     for e in raw_entries:
+        if seen >= _ENTRIES_LIMIT_INT:
+            break
         if not isinstance(e, dict):
             continue
         
@@ -163,10 +331,21 @@ def fetch_all_entries(source_url: str) -> list:
         webpage_url = e.get("webpage_url") or e.get("original_url") or e.get("url")
         if not webpage_url:
             continue
+        seen += 1
+
+        if incremental and webpage_url in known:
+            # One known entry may be a pinned post; two in a row is old content.
+            known_run += 1
+            if known_run >= 2:
+                break
+            continue
+        known_run = 0
 
+        # ie_key / extractor_key are capitalized ("Youtube"); store the baseline's "youtube"
+        extractor = e.get("extractor") or e.get("extractor_key") or e.get("ie_key") or info.get("extractor")
         entry = {
             "source": source_url,
-            "extractor": e.get("extractor") or e.get("extractor_key"),
+            "extractor": extractor.lower() if extractor else None,
             "upload_date": None,  # yt-dlp flat list has no publish time; set at download
             "duration": e.get("duration"),
             "language": e.get("language"),
@@ -177,13 +356,44 @@ def fetch_all_entries(source_url: str) -> list:
 
         entries.append(entry)
 
-    print(f"Fetched {len(entries)} entries from {source_url}")
+    if state is not None:
+        state["_ok"] = True
+        if info.get("_type") == "playlist" and info.get("channel_id"):
+            state["channel_id"] = info["channel_id"]  # enables the feed path next time
+
+    print(f"Fetched {len(entries)} {'new ' if incremental else ''}entries from {source_url}")
+    entries.reverse()  # old -> new
+    return entries
+
+def _fetch_feed(source_url: str, known: set, state: dict) -> list | None:
+    items = youtube_feed.fetch_feed_entries(source_url, state, _ENTRIES_LIMIT_INT)
+    if items is None:
+        return None
+    entries = []
+    for it in items:
+        webpage_url = f"https://www.youtube.com/watch?v={it['video_id']}"
+        if webpage_url in known:
+            continue
+        entries.append({
+            "source": source_url,
+            "extractor": "youtube",
+            "upload_date": it["published"],
+            "duration": None,
+            "language": None,
+            "title": it["title"],
+            "webpage_url": webpage_url,
+            "video_id": make_video_id(webpage_url),
+        })
+    print(f"Fetched {len(entries)} new entries from {source_url} (feed)")
     entries.reverse()  # old -> new
     return entries
 
-def download_entry(entry: Video) -> bool:
+def download_entry(entry: Video, meter: Meter | None = None) -> Video:
     '''
-    Download one entry
+    Download one entry; bytes go through `meter` (shared bandwidth budget) and
+    its throughput is printed on success. With SUBTITLES on, a usable platform
+    subtitle is saved instead of the audio and the entry comes back already
+    transcribed.
     
     entry: 
         source            Exist
@@ -198,28 +408,37 @@ def download_entry(entry: Video) -> bool:
         downloaded_at     Nullable  <-
         file_path         Nullable  <-
         download_error    Nullable  <-
-        transcribed       Exist
+        transcribed       Exist     <- (subtitles)
         summarized        Exist
         pushed            Exist
         video_id          Exist
     '''
+    meter = meter or Meter()
+
     # Douyin source: prefer the cached direct URL (0 API calls); re-resolve on miss.
     if douyin_downloader.is_douyin(entry.source) or douyin_downloader.is_douyin(entry.webpage_url):
         saved = douyin_downloader.download_to(
-            entry.webpage_url, AUDIO_DIR / entry.video_id, entry.video_id
+            entry.webpage_url, AUDIO_DIR / entry.video_id, entry.video_id, meter
         )
         if saved:
             entry.downloaded = 1
             entry.downloaded_at = datetime.now().isoformat(timespec="seconds")
             entry.file_path = str(saved)
             entry.download_error = None
+            print(meter.report(entry.video_id))
         else:
             entry.downloaded = 0
             entry.download_error = "douyin download failed"
         return entry
 
     outtmpl = str(AUDIO_DIR / f"{entry.video_id}.%(ext)s")
-    out_path = AUDIO_DIR / f"{entry.video_id}.mp3"
+
+    if AUDIO_FORMAT == "mp3":
+        extract = {"key": "FFmpegExtractAudio", "preferredcodec": "mp3", "preferredquality": "192"}
+    else:
+        # "best" stream-copies the audio track (opus/m4a/...) and drops any video:
+        # a remux, not a transcode. Whisper decodes every container to PCM itself.
+        extract = {"key": "FFmpegExtractAudio", "preferredcodec": "best"}
 
     ydl_opts = {
         "quiet": True,
@@ -227,50 +446,110 @@ def download_entry(entry: Video) -> bool:
         "no_warnings": True,
         "format": "bestaudio/best",
         "noplaylist": True,
-        "postprocessors": [{
-            "key": "FFmpegExtractAudio",
-            "preferredcodec": "mp3",
-            "preferredquality": "192",
-        }],
+        "postprocessors": [extract],
         "outtmpl": outtmpl,
         "logger": _SilentLogger(),
         "ffmpeg_location": FFMPEG_BIN,
+        "progress_hooks": [_progress_hook],
     }
 
-    _android = {"extractor_args": {"youtube": {"player_client": ["android"]}}}
-    attempts = [
-        ({},        True),
-        (_android,  True),
-        ({},        False),
-    ]
-
+    key = (entry.extractor or platform(entry.webpage_url)).lower()
     last_error = None
+    permanent = True  # until a strategy fails in a way a retry might fix
+    _ydl_local.meter = meter
 
-    for extra, inject in attempts:
+    for name in strategy_cache.order(key):
         try:
-            with YoutubeDL({**ydl_opts, **extra}) as ydl:
-                if inject:
-                    _inject(ydl)
-                info = ydl.extract_info(entry.webpage_url, download=True)
-            if out_path.exists():
+            ydl = _ydl("download", name, ydl_opts)
+            _set_outtmpl(ydl, outtmpl)
+            # Extract first, then download from the same result: the subtitle
+            # check costs no extra request.
+            info = ydl.extract_info(entry.webpage_url, download=False, process=False)
+            if not entry.duration and info.get("duration"):
+                # listed without a duration (feed): admission can decide only now
+                entry.duration = int(info["duration"])
+                if not hold(entry):
+                    print(f"{entry.video_id} held back: {entry.defer_reason}")
+                    return entry
+            if SUBTITLES != "off" and _ingest_subtitles(ydl, entry, info):
+                strategy_cache.success(key, name)
+                print(f"{entry.video_id} subtitles used, audio skipped")
+                return entry
+            info = ydl.process_ie_result(info, download=True)
+            out_path = _saved_audio(entry.video_id)
+            if out_path:
+                strategy_cache.success(key, name)
                 entry.downloaded = 1
                 entry.downloaded_at = datetime.now().isoformat(timespec="seconds")
                 entry.file_path = str(out_path)
                 entry.download_error = None
                 entry.upload_date = _time_format_ytdlp(info or {})
+                entry.duration = int((info or {}).get("duration") or entry.duration or 0) or None
+                print(meter.report(entry.video_id))
                 return entry
 
-            # ffmpeg did not create MP3
-            last_error = "mp3 not created"
+            # ffmpeg did not create the audio file
+            last_error = f"{AUDIO_FORMAT} audio not created"
 
         except Exception as e:
             last_error = f"{type(e).__name__}: {e}"
+        permanent = permanent and _is_permanent(last_error)
+        strategy_cache.failure(key, name)
 
     entry.downloaded = 0
     entry.download_error = last_error or "download failed"
+    entry.dead = 1 if permanent and last_error else 0
     print(f"{entry.webpage_url} download failed: {entry.download_error}")
     return entry
 
+# Shorter than this and a subtitle is more likely a stub than a transcript.
+_MIN_SUBTITLE_CHARS = 200
+
+def _ingest_subtitles(ydl: YoutubeDL, entry: Video, info: dict) -> bool:
+    """Save the entry's platform subtitle as its transcript (whisper.txt, same
+    header the transcriber writes) and mark it downloaded + transcribed."""
+    language = entry.language or info.get("language")
+    picked = subtitles.pick_track(info, language, allow_auto=(SUBTITLES == "any"))
+    if not picked:
+        return False
+    code, fmt = picked
+    try:
+        raw = fmt.get("data") or ydl.urlopen(fmt["url"]).read().decode("utf-8", "replace")
+    except Exception:
+        return False
+    text = subtitles.subtitle_text(raw)
+    if len(text) < _MIN_SUBTITLE_CHARS:
+        return False
+
+    # file_path's stem is what the summarizer keys OUTPUT_DIR on
+    sub_path = AUDIO_DIR / f"{entry.video_id}.{fmt['ext']}"
+    sub_path.write_text(raw, encoding="utf-8")
+    output_dir = OUTPUT_DIR / entry.video_id
+    output_dir.mkdir(parents=True, exist_ok=True)
+    start_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    (output_dir / "whisper.txt").write_text(
+        f"{entry.video_id} at {start_time}:\n{text}\n", encoding="utf-8"
+    )
+
+    now = datetime.now().isoformat(timespec="seconds")
+    entry.downloaded = 1
+    entry.downloaded_at = now
+    entry.file_path = str(sub_path)
+    entry.download_error = None
+    entry.transcribed = 1
+    entry.language = entry.language or code
+    entry.upload_date = _time_format_ytdlp(info) or entry.upload_date
+    entry.duration = entry.duration or info.get("duration")
+    return True
+
+def _saved_audio(video_id: str) -> Path | None:
+    """The finished audio file for video_id, whatever container it ended up in."""
+    found = [
+        p for p in AUDIO_DIR.glob(f"{video_id}.*")
+        if p.is_file() and p.suffix.lower() in AUDIO_SUFFIXES
+    ]
+    return max(found, key=lambda p: p.stat().st_mtime) if found else None
+
 def import_external_entries(session):
     # Scan AUDIO_DIR for audio files not in DB and insert them for transcription.
     now = datetime.now()
@@ -0,0 +1,208 @@
+"""Resumable HTTP downloads over one pooled requests.Session.
+
+fetch() streams a URL into a `.part` file and, when interrupted, picks up
+from the bytes already on disk with an HTTP Range request. Connection
+errors and 5xx answers are retried with exponential backoff; a 403/404/410
+means a signed CDN link expired and raises LinkExpired, leaving the partial
+file in place so the caller can re-resolve the URL and resume.
+
+Large files (>= _PARALLEL_MIN, server honouring ranges) are fetched as
+_PARALLEL_PARTS ranges side by side: the first range continues on the
+response already open, the others go to `<part>.1`, `<part>.2`, ... and
+are appended once all are complete. Their layout is kept in `<part>.json`,
+so a parallel download resumes per range as well.
+"""
+from __future__ import annotations
+
+import json
+import random
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .limits import Meter
+
+_CHUNK = 1 << 16
+_RETRIES = 4
+_BACKOFF = 1.0                  # seconds, doubled per retry
+_TIMEOUT = (10, 60)             # connect, read
+_PARALLEL_MIN = 32 << 20        # bytes
+_PARALLEL_PARTS = 4
+_EXPIRED = (403, 404, 410)
+
+_session: requests.Session | None = None
+_session_lock = threading.Lock()
+
+
+class LinkExpired(Exception):
+    """The URL no longer serves the file (expired signature); re-resolve it."""
+
+
+class DownloadError(Exception):
+    pass
+
+
+def session() -> requests.Session:
+    """The shared session: keep-alive connections reused across downloads."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            s = requests.Session()
+            adapter = HTTPAdapter(pool_connections=8, pool_maxsize=16, max_retries=0)
+            s.mount("https://", adapter)
+            s.mount("http://", adapter)
+            _session = s
+        return _session
+
+
+def _size(path: Path) -> int:
+    try:
+        return path.stat().st_size
+    except OSError:
+        return 0
+
+
+def _total(resp) -> int | None:
+    """Full file size from Content-Range ('bytes 0-99/1234') or Content-Length."""
+    m = re.search(r"/(\d+)$", resp.headers.get("Content-Range", ""))
+    if m:
+        return int(m.group(1))
+    if resp.status_code == 200 and resp.headers.get("Content-Length", "").isdigit():
+        return int(resp.headers["Content-Length"])
+    return None
+
+
+def _open(url: str, headers: dict, start: int, end: int | None):
+    """GET bytes [start, end) (end None = to EOF). Always ranged, so a 206
+    tells us the server can resume and how big the file is."""
+    h = dict(headers)
+    h["Range"] = f"bytes={start}-{'' if end is None else end - 1}"
+    r = session().get(url, headers=h, stream=True, timeout=_TIMEOUT)
+    if r.status_code in _EXPIRED:
+        r.close()
+        raise LinkExpired(f"HTTP {r.status_code}")
+    if r.status_code == 416:  # nothing left to send
+        return r
+    r.raise_for_status()
+    return r
+
+
+def _drain(resp, path: Path, limit: int | None, meter: Meter, append: bool) -> None:
+    """Write the response body to `path` until EOF or `limit` bytes."""
+    left = limit
+    with open(path, "ab" if append else "wb") as f:
+        for chunk in resp.iter_content(chunk_size=_CHUNK):
+            if not chunk:
+                continue
+            if left is not None:
+                chunk = chunk[:left]
+                left -= len(chunk)
+            f.write(chunk)
+            meter.add(len(chunk))
+            if left == 0:
+                break
+
+
+def _segment(url: str, headers: dict, path: Path, start: int, end: int | None,
+             meter: Meter, resp=None) -> None:
+    """Fill `path` with bytes [start, end), resuming from what it holds;
+    retried with backoff. `resp` is an already open response for `start`."""
+    for attempt in range(_RETRIES + 1):
+        try:
+            offset = start + _size(path)
+            if end is not None and offset >= end:
+                return
+            if resp is None:
+                resp = _open(url, headers, offset, end)
+            with resp:
+                if resp.status_code == 416:
+                    return
+                if resp.status_code == 200 and offset:
+                    if start:
+                        raise DownloadError("server ignored the range request")
+                    path.unlink(missing_ok=True)  # whole file again, from 0
+                    offset = 0
+                limit = None if end is None else end - offset
+                _drain(resp, path, limit, meter, append=True)
+            resp = None
+            if end is None or start + _size(path) >= end:
+                return
+        except (LinkExpired, DownloadError):
+            raise
+        except Exception as e:
+            resp = None
+            if attempt == _RETRIES:
+                raise DownloadError(f"{type(e).__name__}: {e}") from e
+        time.sleep(_BACKOFF * 2 ** attempt * random.uniform(0.8, 1.2))
+    raise DownloadError("incomplete download")
+
+
+def _bounds(total: int) -> list[int]:
+    step = -(-total // _PARALLEL_PARTS)
+    return [min(i * step, total) for i in range(_PARALLEL_PARTS)] + [total]
+
+
+def _parallel(url: str, headers: dict, part: Path, bounds: list[int],
+              meter: Meter, first=None) -> None:
+    paths = [part] + [part.with_name(f"{part.name}.{i}") for i in range(1, len(bounds) - 1)]
+    with ThreadPoolExecutor(max_workers=len(paths) - 1, thread_name_prefix="range") as pool:
+        futs = [
+            pool.submit(_segment, url, headers, paths[i], bounds[i], bounds[i + 1], meter)
+            for i in range(1, len(paths))
+        ]
+        _segment(url, headers, paths[0], bounds[0], bounds[1], meter, resp=first)
+        for f in futs:
+            f.result()
+    with open(part, "ab") as out:
+        for p in paths[1:]:
+            with open(p, "rb") as f:
+                while block := f.read(1 << 20):
+                    out.write(block)
+            p.unlink()
+    part.with_name(part.name + ".json").unlink(missing_ok=True)
+
+
+def fetch(url: str, part: Path, headers: dict | None = None,
+          meter: Meter | None = None) -> str:
+    """Download `url` into `part`, resuming whatever is already there.
+    Returns the response Content-Type. Raises LinkExpired / DownloadError;
+    the partial data stays on disk for the next attempt either way."""
+    headers = headers or {}
+    meter = meter or Meter()
+    part.parent.mkdir(parents=True, exist_ok=True)
+    layout = part.with_name(part.name + ".json")
+
+    if layout.exists():
+        try:
+            saved = json.loads(layout.read_text(encoding="utf-8"))
+            _parallel(url, headers, part, saved["bounds"], meter)
+            return saved.get("content_type", "")
+        except (LinkExpired, DownloadError):
+            raise
+        except Exception:
+            layout.unlink(missing_ok=True)  # unreadable layout: start over
+            part.unlink(missing_ok=True)
+
+    have = _size(part)
+    try:
+        resp = _open(url, headers, have, None)
+    except LinkExpired:
+        raise
+    except Exception as e:
+        raise DownloadError(f"{type(e).__name__}: {e}") from e
+    content_type = resp.headers.get("Content-Type", "")
+    total = _total(resp)
+    if (not have and resp.status_code == 206 and total and total >= _PARALLEL_MIN
+            and _PARALLEL_PARTS > 1):
+        bounds = _bounds(total)
+        layout.write_text(json.dumps({"bounds": bounds, "content_type": content_type}),
+                          encoding="utf-8")
+        _parallel(url, headers, part, bounds, meter, first=resp)
+    else:
+        _segment(url, headers, part, 0, total, meter, resp=resp)
+    return content_type
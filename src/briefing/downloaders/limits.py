@@ -0,0 +1,112 @@
+"""Per-platform concurrency caps and the shared bandwidth budget.
+
+Sources are bucketed by platform (from the URL host); each bucket has a fixed
+number of slots per phase so a parallel pass never hammers one site hard
+enough to get rate limited, while different platforms proceed side by side.
+All downloads draw their bytes from one token bucket (BANDWIDTH_LIMIT) so
+concurrency never saturates the uplink.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
+from briefing.config import BANDWIDTH_LIMIT
+
+# Max concurrent requests per platform. Douyin's API budget is the scarcest;
+# its downloads hit the CDN, not the API, so they can run wider than listing.
+LIST_LIMITS = {
+    "youtube": 4,
+    "bilibili": 2,
+    "douyin": 1,
+    "other": 2,
+}
+DOWNLOAD_LIMITS = {
+    "youtube": 3,
+    "bilibili": 2,
+    "douyin": 2,
+    "other": 2,
+}
+
+_slots = {
+    "list": {k: threading.BoundedSemaphore(v) for k, v in LIST_LIMITS.items()},
+    "download": {k: threading.BoundedSemaphore(v) for k, v in DOWNLOAD_LIMITS.items()},
+}
+
+
+def platform(url: str) -> str:
+    host = (urlparse(url or "").hostname or "").lower()
+    if "douyin" in host:
+        return "douyin"
+    if host.endswith(("youtube.com", "youtu.be")):
+        return "youtube"
+    if host.endswith(("bilibili.com", "b23.tv")):
+        return "bilibili"
+    return "other"
+
+
+@contextmanager
+def platform_slot(url: str, phase: str = "list"):
+    """Hold one of the URL's platform slots for `phase` for the whole block."""
+    sem = _slots[phase][platform(url)]
+    with sem:
+        yield
+
+
+class TokenBucket:
+    """Byte budget shared across threads; rate None means unlimited.
+
+    consume() may overdraw; the caller then sleeps off its own debt outside
+    the lock, so the aggregate rate holds without serializing downloads.
+    """
+
+    def __init__(self, rate: float | None, burst: float | None = None):
+        self.rate = rate
+        self.capacity = burst or rate or 0
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def consume(self, n: int) -> None:
+        if not self.rate or n <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            self._tokens -= n
+            debt = -self._tokens
+        if debt > 0:
+            time.sleep(debt / self.rate)
+
+
+bandwidth = TokenBucket(BANDWIDTH_LIMIT * 1024 if BANDWIDTH_LIMIT else None)
+
+
+class Meter:
+    """One download's byte count, charged against the shared bandwidth budget."""
+
+    def __init__(self):
+        self.bytes = 0
+        self.started = time.monotonic()
+        self._seen = {}  # yt-dlp filename -> bytes already counted
+
+    def add(self, n: int) -> None:
+        self.bytes += n
+        bandwidth.consume(n)
+
+    def ytdlp_hook(self, d: dict) -> None:
+        """yt-dlp progress hook; blocking here throttles that download."""
+        if d.get("status") not in ("downloading", "finished"):
+            return
+        name = d.get("filename") or ""
+        done = d.get("downloaded_bytes") or d.get("total_bytes") or 0
+        delta = done - self._seen.get(name, 0)
+        if delta > 0:
+            self._seen[name] = done
+            self.add(delta)
+
+    def report(self, label: str) -> str:
+        secs = max(time.monotonic() - self.started, 1e-3)
+        mb = self.bytes / (1 << 20)
+        return f"[download] {label} {mb:.1f} MB in {secs:.1f}s ({mb / secs:.2f} MB/s)"
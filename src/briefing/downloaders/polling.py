@@ -0,0 +1,131 @@
+"""When to poll each source next.
+
+Every source gets a stable phase inside DOWNLOAD_INTERVAL (from a hash of its
+URL), so hundreds of channels are spread evenly across the interval instead of
+all being listed in one burst; a little random jitter keeps them from locking
+into step with anything else. A source whose listing fails backs off
+(1x, 2x, 4x, 8x the interval, at most MAX_POLL_INTERVAL) until it succeeds again.
+
+Sources with enough upload history are instead polled on a learned cadence:
+uploads are binned by hour of day and day of week, and the next poll is set
+where about half a new upload is expected, so a channel that posts every
+evening is checked densely around then and rarely at night, and a channel that
+posts monthly is checked about once a day. The gap always stays within
+MIN_POLL_INTERVAL..MAX_POLL_INTERVAL.
+
+plan_poll() updates the source's state dict (a sources row, see
+db.get_source_states) in place; the downloader persists it.
+"""
+import hashlib
+import json
+import math
+import random
+from datetime import datetime
+
+from briefing.config import DOWNLOAD_INTERVAL, MIN_POLL_INTERVAL, MAX_POLL_INTERVAL
+
+_MIN_INTERVAL = 60          # seconds; DOWNLOAD_INTERVAL may be 0
+_JITTER = 0.05              # +-5% of the interval
+_MAX_BACKOFF = 8            # x interval
+_RATE_SMOOTHING = 0.3       # weight of the newest sample in items_per_day
+_HISTORY_MAX = 200          # upload times kept per source
+_MIN_HISTORY = 5            # fewer uploads than this -> fixed-interval slots
+_TARGET_UPLOADS = 0.5       # expected new uploads per poll
+_PRIOR = 1.0                # pseudo-count smoothing each hour / weekday bin
+
+
+def _phase(url: str) -> float:
+    return int(hashlib.sha1(url.encode("utf-8")).hexdigest()[:8], 16) / 0x100000000
+
+
+def next_slot(url: str, now: float, interval: float) -> float:
+    """The source's next phase slot at least half an interval from now."""
+    phase = _phase(url)
+    k = math.ceil((now + interval / 2) / interval - phase)
+    return (k + phase) * interval
+
+
+def _merge_history(state: dict, upload_dates) -> list[datetime]:
+    """Union of the stored history and `upload_dates`, oldest first, capped."""
+    try:
+        seen = set(json.loads(state.get("upload_history") or "[]"))
+    except ValueError:
+        seen = set()
+    seen.update(d for d in (upload_dates or ()) if d)
+    times = []
+    for d in sorted(seen)[-_HISTORY_MAX:]:
+        try:
+            times.append(datetime.fromisoformat(d))
+        except ValueError:
+            continue
+    state["upload_history"] = json.dumps(
+        [t.isoformat(sep=" ", timespec="seconds") for t in times])
+    return times
+
+
+class _Cadence:
+    """Upload rate per hour as (overall rate) x (hour-of-day factor) x
+    (weekday factor), each factor smoothed towards 1 so sparse bins still
+    get some probability."""
+
+    def __init__(self, times: list[datetime], now: float):
+        span_h = max((now - times[0].timestamp()) / 3600, 7 * 24)
+        self.rate = len(times) / span_h
+        # date-only publish times (yt-dlp upload_date) carry no hour
+        timed = [t for t in times if (t.hour, t.minute, t.second) != (0, 0, 0)]
+        self.hour = self._factors([t.hour for t in timed], 24)
+        self.day = self._factors([t.weekday() for t in times], 7)
+
+    @staticmethod
+    def _factors(values: list[int], bins: int) -> list[float]:
+        counts = [0] * bins
+        for v in values:
+            counts[v] += 1
+        mean = len(values) / bins
+        return [(c + _PRIOR) / (mean + _PRIOR) for c in counts]
+
+    def gap(self, now: float, lo: float, hi: float) -> float:
+        """Seconds from `now` until _TARGET_UPLOADS are expected, within lo..hi."""
+        expected, t = 0.0, now
+        while t - now < hi:
+            local = datetime.fromtimestamp(t)
+            step = 3600 - (local.minute * 60 + local.second)
+            inc = self.rate * self.hour[local.hour] * self.day[local.weekday()] * step / 3600
+            if expected + inc >= _TARGET_UPLOADS:
+                t += step * (_TARGET_UPLOADS - expected) / inc
+                return min(max(t - now, lo), hi)
+            expected += inc
+            t += step
+        return hi
+
+
+def plan_poll(url: str, state: dict, now: float, new_items: int, ok: bool,
+              upload_dates=None) -> None:
+    interval = max(DOWNLOAD_INTERVAL or 0, _MIN_INTERVAL)
+    history = _merge_history(state, upload_dates)
+
+    last = state.get("last_polled")
+    if ok and last and now > last:
+        rate = new_items / ((now - last) / 86400)
+        prev = state.get("items_per_day") or 0.0
+        state["items_per_day"] = round(prev + _RATE_SMOOTHING * (rate - prev), 4)
+    state["last_polled"] = now
+
+    if ok and len(history) >= _MIN_HISTORY:
+        state["failures"] = 0
+        gap = _Cadence(history, now).gap(now, MIN_POLL_INTERVAL, MAX_POLL_INTERVAL)
+        gap *= 1 + random.uniform(-_JITTER, _JITTER)
+        # clamped after the jitter, so the gap never leaves its configured bounds
+        state["next_due"] = now + min(max(gap, MIN_POLL_INTERVAL), MAX_POLL_INTERVAL)
+        return
+
+    if not ok:
+        state["failures"] = (state.get("failures") or 0) + 1
+        gap = interval * min(2 ** (state["failures"] - 1), _MAX_BACKOFF)
+        gap *= 1 + random.uniform(-_JITTER, _JITTER)
+        state["next_due"] = now + min(gap, MAX_POLL_INTERVAL)  # backoff never exceeds the max
+        return
+
+    state["failures"] = 0
+    due = next_slot(url, now, interval)
+    state["next_due"] = due + random.uniform(-_JITTER, _JITTER) * interval
@@ -0,0 +1,86 @@
+"""Remember which yt-dlp attempt strategy works, per source / extractor.
+
+fetch_all_entries() and download_entry() share one fixed fallback list
+(cookies + default client, cookies + android client, no cookies). Walking it
+from the top costs a source that only works with the last strategy two
+failing round-trips every time, so the last winner per key is tried first.
+A winner that keeps working gains score (capped); each failure takes one
+point, and at zero the key falls back to the default order.
+
+Persisted as a small JSON file, loaded once and written at the end of a pass.
+"""
+import json
+import os
+import threading
+
+from briefing.config import DATA_DIR
+
+_android = {"extractor_args": {"youtube": {"player_client": ["android"]}}}
+
+# name -> (extra yt-dlp options, inject cookies)
+STRATEGIES = {
+    "default":   ({},        True),
+    "android":   (_android,  True),
+    "anonymous": ({},        False),
+}
+DEFAULT_ORDER = ("default", "android", "anonymous")
+
+_FILE = DATA_DIR / ".ytdlp_strategies.json"
+_MAX_SCORE = 3
+
+
+class StrategyCache:
+    def __init__(self, path):
+        self._path = path
+        self._lock = threading.Lock()
+        self._dirty = False
+        try:
+            self._data = json.loads(path.read_text(encoding="utf-8"))
+        except Exception:
+            self._data = {}
+
+    def order(self, key: str) -> list[str]:
+        """Strategy names to try for `key`, last winner first."""
+        with self._lock:
+            best = (self._data.get(key) or {}).get("best")
+        if best not in STRATEGIES:
+            return list(DEFAULT_ORDER)
+        return [best] + [s for s in DEFAULT_ORDER if s != best]
+
+    def success(self, key: str, name: str) -> None:
+        with self._lock:
+            rec = self._data.get(key)
+            if rec and rec.get("best") == name:
+                if rec["score"] >= _MAX_SCORE:
+                    return
+                rec["score"] += 1
+            else:
+                self._data[key] = {"best": name, "score": 1}
+            self._dirty = True
+
+    def failure(self, key: str, name: str) -> None:
+        with self._lock:
+            rec = self._data.get(key)
+            if not rec or rec.get("best") != name:
+                return
+            rec["score"] -= 1
+            if rec["score"] <= 0:
+                del self._data[key]
+            self._dirty = True
+
+    def save(self) -> None:
+        with self._lock:
+            if not self._dirty:
+                return
+            data = json.dumps(self._data, ensure_ascii=False)
+            self._dirty = False
+        try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self._path.with_suffix(".tmp")
+            tmp.write_text(data, encoding="utf-8")
+            os.replace(tmp, self._path)
+        except Exception:
+            pass
+
+
+strategy_cache = StrategyCache(_FILE)
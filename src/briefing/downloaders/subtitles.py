@@ -0,0 +1,78 @@
+"""Platform subtitles as a stand-in for Whisper.
+
+yt-dlp's info dict lists uploaded tracks under `subtitles` and generated ones
+under `automatic_captions`, keyed by language code, each with a few formats.
+pick_track() chooses one in the entry's own language (uploaded first); a
+YouTube auto track is only taken when it is the original-language one
+("<lang>-orig" or the plain code), never a machine translation.
+subtitle_text() flattens WebVTT/SRT to plain lines for whisper.txt.
+"""
+from __future__ import annotations
+
+import html
+import re
+
+_TEXT_FORMATS = ("vtt", "srt")
+_SKIP_TRACKS = {"live_chat", "danmaku", "comments"}
+_TAG = re.compile(r"<[^>]+>")
+_TIMING = re.compile(r"-->")
+
+
+def _base(code: str) -> str:
+    """'en-US' / 'en-orig' / 'ai-zh' (Bilibili AI subs) -> 'en' / 'en' / 'zh'."""
+    code = code.lower()
+    if code.startswith("ai-"):
+        code = code[3:]
+    return code.split("-")[0].split("_")[0]
+
+
+def _text_format(formats) -> dict | None:
+    for ext in _TEXT_FORMATS:
+        for f in formats or ():
+            if f.get("ext") == ext and (f.get("url") or f.get("data")):
+                return f
+    return None
+
+
+def pick_track(info: dict, language: str | None, allow_auto: bool) -> tuple[str, dict] | None:
+    """(track code, format dict) of the best usable subtitle, or None."""
+    lang = _base(language) if language else ""
+
+    manual = {k: v for k, v in (info.get("subtitles") or {}).items() if k not in _SKIP_TRACKS}
+    if lang:
+        codes = sorted((k for k in manual if _base(k) == lang), key=lambda k: (k.lower() != lang, k))
+    else:
+        codes = list(manual) if len(manual) == 1 else []  # unknown language: only if unambiguous
+    for code in codes:
+        fmt = _text_format(manual[code])
+        if fmt:
+            return code, fmt
+
+    if not allow_auto:
+        return None
+    auto = info.get("automatic_captions") or {}
+    origs = [k for k in auto if k.endswith("-orig") and (not lang or _base(k) == lang)]
+    codes = origs + ([lang] if lang and lang in auto else [])
+    for code in codes:
+        fmt = _text_format(auto[code])
+        if fmt:
+            return code, fmt
+    return None
+
+
+def subtitle_text(raw: str) -> str:
+    """WebVTT / SRT -> one line per caption, cue numbers, timings, tags and
+    the rolling repeats of auto captions removed."""
+    lines: list[str] = []
+    in_header = raw.lstrip("﻿").startswith("WEBVTT")
+    for line in raw.splitlines():
+        line = line.strip()
+        if in_header:
+            in_header = bool(line)  # header block ends at the first blank line
+            continue
+        if not line or line.isdigit() or _TIMING.search(line) or line.startswith("NOTE"):
+            continue
+        text = html.unescape(_TAG.sub("", line)).strip()
+        if text and text not in lines[-2:]:
+            lines.append(text)
+    return "\n".join(lines)
@@ -0,0 +1,123 @@
+"""Cheap YouTube listing via the public Atom feed.
+
+A channel/playlist feed is one small XML document with the newest ~15 uploads
+and their publish times. Requests are conditional (ETag / If-Modified-Since),
+so an unchanged feed costs a 304 and no parsing. Anything the feed can't
+answer (no channel id yet, shorts/streams tabs, HTTP errors) returns None
+and the caller falls back to yt-dlp.
+
+Per-source state (channel_id, etag, last_modified) lives in the sources table;
+fetch_feed_entries() reads and updates the dict it is given.
+
+Set YT_FEED_BASE to point at a local HTTP stand-in serving recorded feeds.
+"""
+from __future__ import annotations
+
+import os
+import xml.etree.ElementTree as ET
+from datetime import datetime
+from urllib.parse import urlparse, parse_qs
+
+import requests
+
+FEED_BASE = os.environ.get("YT_FEED_BASE", "https://www.youtube.com/feeds/videos.xml")
+
+_NS = {
+    "a": "http://www.w3.org/2005/Atom",
+    "yt": "http://www.youtube.com/xml/schemas/2015",
+}
+_UA = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36"
+)
+
+# Channel tabs whose content matches the feed (uploads); shorts are dropped
+# because yt-dlp's default /videos tab doesn't list them either.
+_FEED_TABS = ("", "videos", "featured")
+
+
+def feed_url(source_url: str, channel_id: str | None = None) -> str | None:
+    """Feed URL for a YouTube playlist/channel source, or None if the feed
+    can't stand in for it (single videos, youtu.be links, other tabs)."""
+    u = urlparse(source_url)
+    playlist = parse_qs(u.query).get("list")
+    if playlist:
+        return f"{FEED_BASE}?playlist_id={playlist[0]}"
+
+    parts = [p for p in u.path.split("/") if p]
+    host = (u.hostname or "").lower()
+    if not parts or host.endswith("youtu.be"):
+        return None
+    if parts[0] == "channel" and len(parts) >= 2:
+        channel_id = parts[1]
+        tab = parts[2] if len(parts) > 2 else ""
+    elif parts[0] in ("c", "user") and len(parts) >= 2:
+        tab = parts[2] if len(parts) > 2 else ""
+    elif parts[0].startswith("@"):
+        tab = parts[1] if len(parts) > 1 else ""
+    else:
+        return None  # watch, shorts/<id>, live/<id>, ...
+    if tab not in _FEED_TABS or not channel_id:
+        return None
+    return f"{FEED_BASE}?channel_id={channel_id}"
+
+
+def _published(text: str | None) -> str | None:
+    """Atom '2025-12-23T08:00:01+00:00' -> local 'YYYY-MM-DD HH:MM:SS'."""
+    try:
+        dt = datetime.fromisoformat((text or "").replace("Z", "+00:00"))
+        return dt.astimezone().replace(tzinfo=None).isoformat(sep=" ", timespec="seconds")
+    except Exception:
+        return None
+
+
+def parse_feed(xml_bytes: bytes) -> list[dict]:
+    """Feed entries newest-first as {video_id, title, published, link}."""
+    root = ET.fromstring(xml_bytes)
+    items = []
+    for e in root.findall("a:entry", _NS):
+        vid = (e.findtext("yt:videoId", default="", namespaces=_NS) or "").strip()
+        if not vid:
+            continue
+        link = e.find("a:link", _NS)
+        items.append({
+            "video_id": vid,
+            "title": e.findtext("a:title", default="", namespaces=_NS),
+            "published": _published(e.findtext("a:published", namespaces=_NS)),
+            "link": link.get("href", "") if link is not None else "",
+        })
+    return items
+
+
+def fetch_feed_entries(source_url: str, state: dict, limit: int) -> list[dict] | None:
+    """Newest-first feed items for a source: [] when unchanged (304), None when
+    the feed is unavailable and yt-dlp must be used instead."""
+    url = feed_url(source_url, state.get("channel_id"))
+    if not url:
+        return None
+
+    headers = {"User-Agent": _UA}
+    if state.get("etag"):
+        headers["If-None-Match"] = state["etag"]
+    if state.get("last_modified"):
+        headers["If-Modified-Since"] = state["last_modified"]
+    try:
+        r = requests.get(url, headers=headers, timeout=15)
+    except Exception:
+        return None
+    if r.status_code == 304:
+        return []
+    if r.status_code != 200:
+        return None
+
+    try:
+        items = parse_feed(r.content)
+    except ET.ParseError:
+        return None
+    state["etag"] = r.headers.get("ETag")
+    state["last_modified"] = r.headers.get("Last-Modified")
+
+    skip_shorts = "list=" not in source_url
+    if skip_shorts:
+        items = [i for i in items if "/shorts/" not in i["link"]]
+    return items[:limit]
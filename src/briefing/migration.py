@@ -39,7 +39,29 @@ def _files(rel: str):
         yield p
 
 
+def _checkpoint() -> None:
+    """The DB runs in WAL mode: fold recent commits into db.sqlite3 before it is copied."""
+    try:
+        from briefing.db import checkpoint
+        checkpoint()
+    except Exception:
+        pass
+
+
+def _release_db() -> None:
+    """Before db.sqlite3 is overwritten: close pooled connections and drop the old
+    WAL / shared-memory files, which would otherwise be replayed into the new DB."""
+    try:
+        from briefing.db import dispose_engines
+        dispose_engines()
+    except Exception:
+        pass
+    for suffix in ("-wal", "-shm"):
+        (DATA_DIR / f"db.sqlite3{suffix}").unlink(missing_ok=True)
+
+
 def export_bytes() -> bytes:
+    _checkpoint()
     members = []
     buf = io.BytesIO()
     with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as z:
@@ -94,6 +116,8 @@ def import_bytes(data: bytes) -> dict:
                 merged = merge_lenient(json.loads(z.read(name)))
                 target.write_text(json.dumps(merged, ensure_ascii=False, indent=2), encoding="utf-8")
             else:
+                if name == "db.sqlite3":
+                    _release_db()
                 with z.open(name) as src, open(target, "wb") as dst:
                     shutil.copyfileobj(src, dst)
             restored += 1
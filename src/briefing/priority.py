@@ -0,0 +1,61 @@
+"""Queue priority of an entry, stored in videos.priority (higher runs first).
+
+The intended score is  weight * 0.5 ** (age_days) / (1 + cost)  : fresh
+uploads from heavily weighted sources that are cheap to process come first.
+Its log2 is stored instead,
+
+    upload_day + log2(weight) - log2(1 + cost)
+
+which orders entries exactly the same at every moment (age shifts all scores
+by the same amount), so a row's priority never needs recomputing as it ages.
+`cost` is the estimated work in half-hours of audio: from duration, or from
+LLM tokens when the duration is unknown. Source weights come from
+SOURCE_WEIGHTS lines '<source url> <weight>' (default 1).
+"""
+import math
+from datetime import datetime
+
+from briefing.config import SOURCE_WEIGHTS
+
+_COST_UNIT = 30 * 60          # seconds of audio per cost unit
+_TOKENS_PER_UNIT = 8000       # ~half an hour of speech
+
+
+def _weights() -> dict[str, float]:
+    out = {}
+    for line in SOURCE_WEIGHTS:
+        url, _, weight = str(line).strip().rpartition(" ")
+        try:
+            w = float(weight)
+        except ValueError:
+            continue
+        if w > 0:
+            out[url.strip()] = w
+    return out
+
+_WEIGHTS = _weights()
+
+
+def _day(text: str | None) -> float | None:
+    """'2025-12-23 08:00:01' / '2025-12-23T08:00:01' / '20251223' -> epoch days."""
+    if not text:
+        return None
+    try:
+        dt = datetime.fromisoformat(text)
+    except ValueError:
+        digits = "".join(c for c in text if c.isdigit())
+        try:
+            dt = datetime.strptime(digits[:8], "%Y%m%d")
+        except ValueError:
+            return None
+    return dt.timestamp() / 86400
+
+
+def entry_priority(v) -> float:
+    day = _day(v.upload_date) or _day(v.inserted_at) or datetime.now().timestamp() / 86400
+    if v.duration:
+        cost = v.duration / _COST_UNIT
+    else:
+        cost = (v.tokens or 0) / _TOKENS_PER_UNIT
+    weight = _WEIGHTS.get(v.source, 1.0)
+    return round(day + math.log2(weight) - math.log2(1 + cost), 6)
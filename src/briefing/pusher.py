@@ -3,7 +3,7 @@ import requests
 from datetime import datetime
 
 from briefing.config import api_model, READ_LANGUAGE, OUTPUT_DIR, NTFY_SERVER, COMPRESS_LEVEl, REPORT_DIR, PUSH_TO, load_prompt
-from briefing.db import get_unpushed, update_entries
+from briefing.db import get_unpushed, update_columns
 from briefing.summarizer_agent import request_gpt
 from briefing.summarizer_agent.validators import check_translate, normalize_bold
 
@@ -64,10 +64,11 @@ def translate_and_compress(input: str, language: str):
     system = _TRANSLATE_TMPL.format(language=target, compress=_compress_clause())
     return request_gpt(input, system, api_model["translate_model"], check=check_translate)
 
-def pusher(session, limit: int) -> None:
+def pusher(session, limit: int) -> int:
+    """Push one batch as a single message; returns how many entries were pushed."""
     todo = get_unpushed(session, limit)
     if not todo:
-        return
+        return 0
 
     parts = []
     for v in todo:
@@ -127,7 +128,7 @@ def pusher(session, limit: int) -> None:
             continue
     
     if not parts:
-        return
+        return 0
 
     body = "\n\n".join(parts)
 
@@ -139,10 +140,9 @@ def pusher(session, limit: int) -> None:
             ok = pushto_ntfy(body)
 
         if ok:
-            for v in todo:
-                v.pushed = 1
-            update_entries(session, todo)
+            return update_columns(session, [{"id": v.id, "pushed": 1} for v in todo])
         elif target != "LocalFile":
             pushto_localfile(body)
     except Exception:
-        return
+        return 0
+    return 0
@@ -0,0 +1,41 @@
+"""Wake-ups between worker stages.
+
+A stage that commits work calls notify(<next stage>), so the consumer
+downstream starts at once instead of waiting out its interval. Each stage
+then sleeps in wait() exactly until its next due time (source polls keep
+theirs in the `sources` table, see db.next_poll_due) or the next
+notification, whichever comes first. Notifying a stage nobody waits on
+(serial mode) is a no-op.
+"""
+import threading
+import time
+
+STAGES = ("download", "transcribe", "summarize", "push")
+
+_events = {s: threading.Event() for s in STAGES}
+_stop = threading.Event()
+
+
+def notify(stage: str) -> None:
+    ev = _events.get(stage)
+    if ev is not None:
+        ev.set()
+
+
+def wait(stage: str, until: float) -> bool:
+    """Sleep until `stage` is notified, the epoch `until` passes, or stop().
+    Returns True when woken by a notification."""
+    ev = _events[stage]
+    woke = ev.wait(max(0.0, until - time.time()))
+    ev.clear()  # a notify arriving after this is kept for the next wait
+    return woke and not _stop.is_set()
+
+
+def stop() -> None:
+    _stop.set()
+    for ev in _events.values():
+        ev.set()
+
+
+def stopped() -> bool:
+    return _stop.is_set()
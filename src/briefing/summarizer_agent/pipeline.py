@@ -2,9 +2,10 @@ import tiktoken
 from pathlib import Path
 from multiprocessing import Pool, cpu_count
 
+from briefing import scheduler
 from briefing.config import model_para, api_model, OUTPUT_DIR, resolve_model
 from briefing.config import SUMMARIZER_LIMIT, POOL_NUM
-from briefing.db import get_unsummarized, update_entries, entry_to_payload, payload_to_entry
+from briefing.db import get_unsummarized, BatchWriter, entry_to_payload
 from briefing.llm import completion, completion_cost, model_limits
 
 # per-process LLM usage accumulator, reset per video in one_summarizer
@@ -22,7 +23,8 @@ def one_summarizer(payload):
     except Exception:
         return None
 
-def summarizer(session) -> None:
+def summarizer(session) -> int:
+    """Summarize one batch; returns how many entries finished."""
     # fold any new user feedback into the per-domain style preferences first
     try:
         from briefing.summarizer_agent import evolve
@@ -32,15 +34,14 @@ def summarizer(session) -> None:
 
     todo = get_unsummarized(session, SUMMARIZER_LIMIT)
     if not todo:
-        return
+        return 0
 
     workers = min(cpu_count(), POOL_NUM)
-    with Pool(processes=workers) as pool:
+    with Pool(processes=workers) as pool, \
+         BatchWriter(session, on_flush=lambda _: scheduler.notify("push")) as writer:
         payloads = [entry_to_payload(v) for v in todo]
-        for updated in pool.imap(one_summarizer, payloads):
-            if updated is None:
-                continue
-            update_entries(session, [payload_to_entry(updated)])
+        writer.drain(pool.imap(one_summarizer, payloads))
+    return writer.written
 
 def request_gpt(input, system_content, model, check=None, retries=2):
     """One LLM call via the router; accumulates tokens/cost into _usage.
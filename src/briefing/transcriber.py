@@ -1,3 +1,4 @@
+import atexit
 import os
 from pathlib import Path
 from datetime import datetime
@@ -7,10 +8,17 @@ import contextlib
 #from moviepy import AudioFileClip
 from multiprocessing import Pool, cpu_count
 
+from briefing import scheduler
+from briefing.admission import admit
 from briefing.config import api_model, TRANSCRIBER_LIMIT, POOL_NUM, OUTPUT_DIR, TEMPORARY_DIR, PROGRESS_DIR, FFMPEG_BIN
-from briefing.db import get_untranscribed, update_entries, entry_to_payload, payload_to_entry
+from briefing.db import get_untranscribed, BatchWriter, entry_to_payload
 
 _MODEL = None
+_MODEL_ERROR = None  # set in a pool worker whose model failed to load
+
+# Long-lived pool: each worker loads the Whisper model once in its initializer and
+# keeps it resident, so passes only ship jobs over the pool's task queue.
+_POOL = None
 
 def _write_progress(video_id, pct):
     try:
@@ -39,31 +47,57 @@ def one_transcriber(payload):
     finally:
         _clear_progress(payload.get('video_id'))
 
-def transcriber(session) -> None:
-    todo = get_untranscribed(session, TRANSCRIBER_LIMIT)
+def transcriber(session) -> int:
+    """Transcribe one batch; returns how many entries finished."""
+    todo = admit(session, get_untranscribed(session, TRANSCRIBER_LIMIT))
     if not todo:
-        return
+        return 0
 
-    workers = min(cpu_count(), POOL_NUM)
-    with Pool(processes=workers) as pool:
-        payloads = [entry_to_payload(v) for v in todo]
-        for updated in pool.imap(one_transcriber, payloads):
-            if updated is None:
-                continue
-            update_entries(session, [payload_to_entry(updated)])
+    pool = start_pool()
+    payloads = [entry_to_payload(v) for v in todo]
+    with BatchWriter(session, on_flush=lambda _: scheduler.notify("summarize")) as writer:
+        writer.drain(pool.imap(one_transcriber, payloads))
+    return writer.written
+
+def _init_worker() -> None:
+    # Never raise here: a failing initializer makes Pool respawn workers forever.
+    global _MODEL_ERROR
+    try:
+        load_whisper_model(device="cpu", compute_type="int8")
+    except Exception as e:
+        _MODEL_ERROR = f"{type(e).__name__}: {e}"
+
+def _worker_status(_=None):
+    return _MODEL_ERROR
+
+def start_pool():
+    """Start (once) the warm transcription pool and return it."""
+    global _POOL
+    if _POOL is None:
+        workers = min(cpu_count(), POOL_NUM)
+        _POOL = Pool(processes=workers, initializer=_init_worker)
+        atexit.register(stop_pool)
+    return _POOL
+
+def stop_pool() -> None:
+    global _POOL
+    if _POOL is not None:
+        _POOL.terminate()
+        _POOL.join()
+        _POOL = None
 
 def check_whisper_model() -> None:
     # 1) ensure ffmpeg is available (bundled via imageio-ffmpeg)
     if not FFMPEG_BIN:
         raise RuntimeError("ffmpeg not available (imageio-ffmpeg missing)")
-    
-    # 2) ensure whisper is available
+
+    # 2) warm the pool; the model loaded here stays resident for every later pass
     model_name = api_model["whisper_model"]
-    try:
-        _ = WhisperModel(model_name, device="cpu", compute_type="int8")
-    except Exception as e:
-        print(f"Failed to load model {model_name}: {e}")
-        raise
+    error = start_pool().apply(_worker_status)
+    if error:
+        stop_pool()
+        print(f"Failed to load model {model_name}: {error}")
+        raise RuntimeError(error)
 
 def load_whisper_model(device: str = "cpu", compute_type: str = "int8") -> None:
     global _MODEL
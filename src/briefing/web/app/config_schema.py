@@ -49,6 +49,75 @@ SCHEMA: List[Dict[str, Any]] = [
         "desc": "Worker processes", 
         "cn": "工作进程数"
     },
+    {
+        "name": "Download Workers",
+        "key": "DOWNLOAD_WORKERS",
+        "type": "int", "default": 3, "min": 1, "max": 16,
+        "desc": "Concurrent downloads",
+        "cn": "并发下载数"
+    },
+    {
+        "name": "Bandwidth Limit",
+        "key": "BANDWIDTH_LIMIT",
+        "type": "int_optional", "default": None, "min": 64, "max": 1024 * 1024,
+        "desc": "Total download speed cap in KB/s (empty = unlimited)",
+        "cn": "下载总带宽上限 KB/s（留空不限）"
+    },
+    {
+        "name": "Audio Format",
+        "key": "AUDIO_FORMAT",
+        "type": "select",
+        "default": "native",
+        "choices": ["native", "mp3"],
+        "desc": "native: keep the downloaded audio track as is; mp3: re-encode to 192k MP3",
+        "cn": "native：保留原始音轨不转码；mp3：重新编码为 192k MP3",
+    },
+    {
+        "name": "Douyin Media",
+        "key": "DOUYIN_MEDIA",
+        "type": "select",
+        "default": "audio",
+        "choices": ["audio", "video"],
+        "desc": "audio: save only the audio track of Douyin posts (via ffmpeg); video: save the whole mp4",
+        "cn": "audio：抖音只保存音轨（ffmpeg 提取）；video：保存完整 mp4",
+    },
+    {
+        "name": "Subtitles",
+        "key": "SUBTITLES",
+        "type": "select",
+        "default": "off",
+        "choices": ["off", "manual", "any"],
+        "desc": "Use platform subtitles instead of Whisper when available. manual: uploaded captions only; any: also auto-generated ones",
+        "cn": "有平台字幕时直接使用，跳过 Whisper。manual：仅人工字幕；any：也接受自动生成字幕",
+    },
+    {
+        "name": "Max Duration",
+        "key": "MAX_DURATION",
+        "type": "int_optional", "default": None, "min": 1, "max": 24 * 60,
+        "desc": "Skip entries longer than this many minutes (empty = no limit)",
+        "cn": "跳过超过该时长的条目 分钟（留空不限）"
+    },
+    {
+        "name": "Long Duration",
+        "key": "LONG_DURATION",
+        "type": "int_optional", "default": None, "min": 1, "max": 24 * 60,
+        "desc": "Entries longer than this many minutes wait for off-peak hours (empty = never wait)",
+        "cn": "超过该时长的条目等到空闲时段再处理 分钟（留空不等待）"
+    },
+    {
+        "name": "Off-peak Hours",
+        "key": "OFFPEAK_HOURS",
+        "type": "str", "default": "1-7",
+        "desc": "Local hours when long entries run, start-end (e.g. 1-7, 22-6)",
+        "cn": "长条目处理时段 本地时间 起-止（如 1-7、22-6）"
+    },
+    {
+        "name": "Duration Overrides",
+        "key": "DURATION_OVERRIDES",
+        "type": "list_str", "default": [],
+        "desc": "Per-source max duration: <source url> <minutes>, 0 = no limit",
+        "cn": "按源设置最大时长：<主页链接> <分钟>，0 为不限"
+    },
     {
         "name": "Transcribe Limit", 
         "key": "TRANSCRIBER_LIMIT", 
@@ -80,6 +149,15 @@ SCHEMA: List[Dict[str, Any]] = [
         "desc": "Push to where",
         "cn": "推送到哪里",
     },
+    {
+        "name": "Worker Mode",
+        "key": "WORKER_MODE",
+        "type": "select",
+        "default": "pipeline",
+        "choices": ["pipeline", "serial"],
+        "desc": "pipeline: stages run side by side; serial: one stage after another",
+        "cn": "pipeline：各阶段并行运行；serial：逐阶段串行运行",
+    },
     {
         "name": "Download Interval", 
         "key": "DOWNLOAD_INTERVAL", 
@@ -87,6 +165,20 @@ SCHEMA: List[Dict[str, Any]] = [
         "desc": "Seconds between downloads", 
         "cn": "下载间隔 秒"
     },
+    {
+        "name": "Min Poll Interval",
+        "key": "MIN_POLL_INTERVAL",
+        "type": "int", "default": 15 * 60, "min": 60, "max": 24 * 60 * 60,
+        "desc": "Shortest seconds between polls of one source (learned cadence)",
+        "cn": "单个源最短轮询间隔 秒（自适应）"
+    },
+    {
+        "name": "Max Poll Interval",
+        "key": "MAX_POLL_INTERVAL",
+        "type": "int", "default": 24 * 60 * 60, "min": 60, "max": 7 * 24 * 60 * 60,
+        "desc": "Longest seconds between polls of one source (learned cadence)",
+        "cn": "单个源最长轮询间隔 秒（自适应）"
+    },
     {
         "name": "Process Interval", 
         "key": "PROCESS_INTERVAL", 
@@ -115,6 +207,13 @@ SCHEMA: List[Dict[str, Any]] = [
         "desc": "Channels", 
         "cn": "主页链接"
     },
+    {
+        "name": "Source Weights",
+        "key": "SOURCE_WEIGHTS",
+        "type": "list_str", "default": [],
+        "desc": "Queue weight per source: <source url> <weight>, default 1 (2 = as urgent as a day fresher)",
+        "cn": "按源设置队列权重：<主页链接> <权重>，默认 1（2 相当于新一天）"
+    },
     {
         "name": "Whisper Model",
         "key": "whisper_model",
@@ -5,7 +5,6 @@ from fastapi.responses import FileResponse
 from pathlib import Path
 import json
 import os
-import sqlite3
 import sys
 import threading
 import time
@@ -24,7 +23,7 @@ app.add_middleware(
 
 from briefing.config import STATIC_DIR, DB_PATH, OUTPUT_DIR, PROGRESS_DIR
 from sqlalchemy.orm import Session
-from briefing.db import engine, save_feedback, get_feedback_map, Feedback
+from briefing.db import engine, read_connection, save_feedback, get_feedback_map, Feedback
 
 BROWSER_URL = os.environ.get("RUNNER_URL", "http://localhost:8000/")
 AUTO_OPEN   = os.environ.get("AUTO_OPEN_BROWSER", "1") != "0"
@@ -130,9 +129,7 @@ def get_progress(limit: int = 300):
     def stage(done, error=False):
         return "error" if error else ("done" if done else "pending")
 
-    conn = sqlite3.connect(DB_PATH.as_posix())
-    conn.row_factory = sqlite3.Row
-    try:
+    with read_connection() as conn:
         # SELECT * so a DB not yet migrated to tokens/cost still works.
         cur = conn.execute(
             "SELECT * FROM videos WHERE pushed = 0 ORDER BY inserted_at DESC, id DESC LIMIT ?",
@@ -143,6 +140,8 @@ def get_progress(limit: int = 300):
             vid = (d.get("video_id") or "").strip()
             downloaded = d.get("downloaded") or 0
             dl_err = d.get("download_error") or ""
+            deferred = d.get("defer_reason") or ""
+            held = "error" if d.get("dead") else "deferred"  # dead: rejected by admission
 
             tprog = 0
             pf = PROGRESS_DIR / vid
@@ -156,17 +155,18 @@ def get_progress(limit: int = 300):
                 "video_id": vid,
                 "title": d.get("title") or "",
                 "source": d.get("source") or "",
-                "download": stage(downloaded, bool(dl_err) and not downloaded),
-                "transcribe": stage(d.get("transcribed") or 0),
+                "download": held if deferred and not downloaded
+                            else stage(downloaded, bool(dl_err) and not downloaded),
+                "transcribe": held if deferred and downloaded and not d.get("transcribed")
+                              else stage(d.get("transcribed") or 0),
                 "transcribe_progress": tprog,
                 "summarize": stage(d.get("summarized") or 0),
                 "push": stage(d.get("pushed") or 0),
                 "tokens": int(d.get("tokens") or 0),
                 "cost": float(d.get("cost") or 0.0),
-                "error": dl_err,
+                "error": dl_err or (deferred if d.get("dead") else ""),
+                "deferred": deferred,
             })
-    finally:
-        conn.close()
 
     return {"items": items}
 
@@ -190,9 +190,7 @@ def get_reports(limit: int = 200):
     if not DB_PATH.exists():
         return {"items": rows}
 
-    conn = sqlite3.connect(DB_PATH.as_posix())
-    conn.row_factory = sqlite3.Row
-    try:
+    with read_connection() as conn:
         cur = conn.execute(
             """
             SELECT id, video_id, title, source, downloaded_at, inserted_at, upload_date, pushed, downloaded, webpage_url
@@ -222,8 +220,6 @@ def get_reports(limit: int = 200):
                 "report_exists": bool(report_data),
                 "headline": report_data.get("headline", ""),
             })
-    finally:
-        conn.close()
 
     return {"items": rows}
 
@@ -242,13 +238,10 @@ def get_report_detail(video_id: str):
 
     webpage_url = ""
     if DB_PATH.exists():
-        conn = sqlite3.connect(DB_PATH.as_posix())
-        try:
+        with read_connection() as conn:
             row = conn.execute("SELECT webpage_url FROM videos WHERE video_id = ?", (v,)).fetchone()
             if row:
                 webpage_url = row[0] or ""
-        finally:
-            conn.close()
 
     return {
         "video_id": v,
@@ -4,16 +4,21 @@ from briefing.config import FFMPEG_DIR, require_config
 
 os.environ["PATH"] = str(FFMPEG_DIR) + os.pathsep + os.environ.get("PATH", "")
 
+import threading
 import time
 from sqlalchemy.orm import Session
 
-from briefing.config import DOWNLOAD_INTERVAL, PROCESS_INTERVAL, PUSHER_LIMIT, PUSHER_INTERVAL
-from briefing.db import engine, clean_all, init_db, clean_entries
+from briefing import scheduler
+from briefing.config import DOWNLOAD_INTERVAL, PROCESS_INTERVAL, PUSHER_LIMIT, PUSHER_INTERVAL, WORKER_MODE, SOURCE_URLS
+from briefing.db import engine, clean_all, init_db, clean_entries, next_poll_due, next_retry_due
 from briefing.downloaders.downloader import downloader, import_external_entries
 from briefing.transcriber import transcriber, check_whisper_model
 from briefing.summarizer_agent import summarizer
 from briefing.pusher import pusher
 
+# Interval fields allow 0; never let an idle stage spin faster than this.
+_MIN_IDLE = 10
+
 
 def run() -> None:
     download_timer = 0
@@ -27,7 +32,7 @@ def run() -> None:
         with Session(engine, future=True) as session:
             # ---- downloader ----
             if now - download_timer >= DOWNLOAD_INTERVAL:
-                downloader(session)
+                downloader(session, all_sources=True)
                 download_timer = now
                 time.sleep(10)
 
@@ -47,12 +52,97 @@ def run() -> None:
                 pusher_timer = now
                 time.sleep(10)
 
+        # sleep until the next timer is due instead of spinning
+        next_due = min(download_timer + DOWNLOAD_INTERVAL,
+                       process_timer + PROCESS_INTERVAL,
+                       pusher_timer + PUSHER_INTERVAL)
+        time.sleep(max(0, next_due - time.time()))
+
+
+# ---- pipeline mode: one long-lived consumer per stage, fed by DB state ----
+# Each step returns the epoch it next wants to run; a notification from the
+# stage upstream wakes it earlier. Process/push intervals are only a fallback
+# rescan; each source's next poll is persisted in the sources table.
+
+def _idle(interval: int) -> float:
+    return time.time() + max(interval, _MIN_IDLE)
+
+def _download_due(session) -> float | None:
+    """Earliest source poll or failed-download retry, whichever comes first."""
+    dues = [d for d in (next_poll_due(session, SOURCE_URLS),
+                        next_retry_due(session, SOURCE_URLS)) if d is not None]
+    return min(dues) if dues else None
+
+def _download_step(session) -> float:
+    due = _download_due(session)
+    if due is None:
+        return _idle(DOWNLOAD_INTERVAL)
+    if due > time.time():
+        return due
+    downloader(session)
+    due = _download_due(session)
+    return max(due, time.time() + _MIN_IDLE)
+
+def _transcribe_step(session) -> float:
+    import_external_entries(session)
+    return time.time() if transcriber(session) else _idle(PROCESS_INTERVAL)
+
+def _summarize_step(session) -> float:
+    done = summarizer(session)
+    clean_all(session)
+    return time.time() if done else _idle(PROCESS_INTERVAL)
+
+def _push_step(session) -> float:
+    done = pusher(session, PUSHER_LIMIT)
+    clean_entries(session)
+    return time.time() if done else _idle(PUSHER_INTERVAL)
+
+
+def _stage_loop(name: str, step) -> None:
+    """Run `step` on its own session until stopped, sleeping between passes
+    until its due time or an upstream notification."""
+    while not scheduler.stopped():
+        try:
+            with Session(engine, future=True) as session:
+                until = step(session)
+        except Exception as e:
+            print(f"[{name}] pass failed: {type(e).__name__}: {e}")
+            until = _idle(0)
+        scheduler.wait(name, until)
+
+
+def run_pipeline() -> None:
+    """Downloads (network), transcription (CPU) and summarize/push (LLM IO) run
+    side by side, so end-to-end latency tracks the slowest stage, not their sum."""
+    print("START (pipeline)")
+    stages = [
+        ("download", _download_step),
+        ("transcribe", _transcribe_step),
+        ("summarize", _summarize_step),
+        ("push", _push_step),
+    ]
+    threads = [
+        threading.Thread(target=_stage_loop, args=(name, step),
+                         name=f"stage-{name}", daemon=True)
+        for name, step in stages
+    ]
+    for t in threads:
+        t.start()
+    try:
+        while any(t.is_alive() for t in threads):
+            time.sleep(1)
+    except KeyboardInterrupt:
+        scheduler.stop()
+
 
 def main():
     require_config()
     init_db()
     check_whisper_model()
-    run()
+    if WORKER_MODE == "serial":
+        run()
+    else:
+        run_pipeline()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,27 @@
+import time
+
+from briefing.downloaders import polling
+
+
+def test_failure_backoff_stays_within_max_interval(monkeypatch):
+    monkeypatch.setattr(polling, "DOWNLOAD_INTERVAL", polling.MAX_POLL_INTERVAL)
+    now = time.time()
+    for failures in range(6):
+        state = {"failures": failures}
+        polling.plan_poll("https://example.com/feed", state, now, 0, ok=False)
+        assert state["failures"] == failures + 1
+        assert now < state["next_due"] <= now + polling.MAX_POLL_INTERVAL
+
+
+def test_learned_gap_stays_within_bounds():
+    now = time.time()
+    # a monthly uploader: the learned gap sits at the max interval
+    history = [
+        time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now - 30 * 86400 * i))
+        for i in range(1, 8)
+    ]
+    for _ in range(200):
+        state = {}
+        polling.plan_poll("https://example.com/feed", state, now, 0, True, history)
+        gap = state["next_due"] - now
+        assert polling.MIN_POLL_INTERVAL <= gap <= polling.MAX_POLL_INTERVAL
@@ -0,0 +1,25 @@
+from briefing.downloaders.youtube_feed import FEED_BASE, feed_url
+
+CHANNEL_ID = "UC0123456789abcdefghijkl"
+
+
+def test_single_video_sources_have_no_feed():
+    assert feed_url("https://www.youtube.com/watch?v=dQw4w9WgXcQ", CHANNEL_ID) is None
+    assert feed_url("https://youtu.be/dQw4w9WgXcQ", CHANNEL_ID) is None
+    assert feed_url("https://www.youtube.com/shorts/dQw4w9WgXcQ", CHANNEL_ID) is None
+
+
+def test_channel_and_playlist_sources():
+    expected = f"{FEED_BASE}?channel_id={CHANNEL_ID}"
+    assert feed_url(f"https://www.youtube.com/channel/{CHANNEL_ID}") == expected
+    assert feed_url(f"https://www.youtube.com/channel/{CHANNEL_ID}/videos") == expected
+    assert feed_url("https://www.youtube.com/@someone", CHANNEL_ID) == expected
+    assert feed_url("https://www.youtube.com/@someone/videos", CHANNEL_ID) == expected
+    assert feed_url("https://www.youtube.com/c/someone", CHANNEL_ID) == expected
+    assert feed_url("https://www.youtube.com/user/someone/videos", CHANNEL_ID) == expected
+    assert feed_url("https://www.youtube.com/playlist?list=PL123") == f"{FEED_BASE}?playlist_id=PL123"
+
+
+def test_handle_without_channel_id_or_on_other_tab():
+    assert feed_url("https://www.youtube.com/@someone") is None
+    assert feed_url("https://www.youtube.com/@someone/shorts", CHANNEL_ID) is None